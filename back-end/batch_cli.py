@@ -0,0 +1,205 @@
+"""CSC111 Winter 2024 Project: Car Recommender System
+
+Module Description
+==================
+This module contains a headless command line tool for scoring a whole file of user profiles offline, without the
+pygame interface of front-end/main.py. A profile is the five dropdown choices (engine, horsepower, price, torque
+and car type) and the four slider values (rating, reliability, zero to sixty and max speed) of one user.
+
+Profiles are read from a CSV file with the columns in PROFILE_FIELDS (and an optional 'id' column), or from a JSONL
+file with one object per line, holding either the same fields or a 'preferences' list and a 'weights' list. For each
+profile, one JSON line is written with the ranked matching cars and the cars most similar to the best one:
+
+    {"id": "1", "ranked": [{"name": ..., "score": ..., "image": ..., "performance": ...}, ...],
+     "similar": [{"name": ..., "score": ...}, ...]}
+
+A profile that cannot be read or scored is written as {"id": ..., "error": ...} and the run continues. Profiles are
+read, scored and written one at a time by a pipeline of generators, so a file of any size is scored in bounded
+memory. With more than one worker, profiles are scored by a pool of processes, with a bounded number of profiles in
+flight, and the results are still written in the order of the profiles.
+
+Run this module with the path of a profile file, e.g.
+    python batch_cli.py profiles.csv --cars car_data_set.csv --output results.jsonl --workers 8
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, TextIO, Union
+
+from queries import rank, similar, warm_up
+
+# The fields of a profile: the five dropdown choices, in the order of tree.car_guesser, followed by the four slider
+# values, in the order of tree.car_ranker.
+PROFILE_FIELDS = ['engine', 'hp', 'price', 'torque', 'car_type', 'rating', 'reliability', 'zero_to_sixty',
+                  'max_speed']
+
+
+def read_profiles(profile_file: TextIO, jsonl: bool) -> Iterator[dict]:
+    """Yield every profile of the given open profile file, as a dictionary with an 'id', a 'preferences' list of
+    the five dropdown choices and a 'weights' list of the four slider values.
+
+    Profiles without an 'id' are given their position in the file, starting at 1. A JSONL line that is not a JSON
+    object is yielded as a profile with an 'error' instead, so it is reported without stopping the run.
+    """
+    records = _jsonl_records(profile_file) if jsonl else csv.DictReader(profile_file)
+
+    for position, record in enumerate(records, 1):
+        if isinstance(record, ValueError):
+            yield {'id': position, 'error': repr(record)}
+            continue
+        if 'preferences' in record:
+            preferences, weights = record['preferences'], record.get('weights')
+        else:
+            values = [record.get(field) for field in PROFILE_FIELDS]
+            preferences, weights = values[:5], values[5:]
+        yield {'id': record.get('id', position), 'preferences': preferences, 'weights': weights}
+
+
+def _jsonl_records(profile_file: TextIO) -> Iterator[Union[dict, ValueError]]:
+    """Yield the JSON object on every non-blank line of the given open JSONL file, or the error explaining why a
+    line is not a JSON object.
+    """
+    for line in profile_file:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as error:
+            yield error
+            continue
+        yield record if isinstance(record, dict) else ValueError('expected a JSON object, got ' + line.strip())
+
+
+def score_profile(car_file: str, profile: dict, k: Optional[int] = None, similar_k: int = 5) -> dict:
+    """Return the result line of one profile: its k best matching cars and the similar_k cars most similar to the
+    best one, or the error that kept it from being read or scored.
+    """
+    if 'error' in profile:
+        return {'id': profile['id'], 'error': profile['error']}
+    try:
+        ranked = rank(car_file, profile['preferences'], profile['weights'], k)
+        similar_cars = similar(car_file, ranked[0]['name'], similar_k) if ranked else []
+    except (KeyError, ValueError, TypeError, IndexError) as error:
+        return {'id': profile['id'], 'error': repr(error)}
+    return {'id': profile['id'], 'ranked': ranked, 'similar': similar_cars}
+
+
+def bounded_map(function: Callable, items: Iterable, workers: int, window: int,
+                initializer: Optional[Callable] = None, initargs: tuple = ()) -> Iterator:
+    """Yield function(item) for every item, in order, computed by a pool of the given number of processes, each
+    of which first calls initializer(*initargs) if initializer is not None.
+
+    At most window items are submitted to the pool and not yet yielded, so items are read from the iterable only
+    as fast as their results are consumed.
+
+    Preconditions:
+        - workers > 0
+        - window > 0
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(function, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def score_profiles(car_file: str, profiles: Iterable[dict], k: Optional[int] = None, similar_k: int = 5,
+                   workers: int = 1) -> Iterator[dict]:
+    """Yield the result line of every profile, in order, scoring them with the given number of processes.
+
+    The snapshot of car_file is compiled, if needed, in this process before any worker starts, so the workers only
+    load it.
+    """
+    warm_up(car_file)
+    if workers <= 1:
+        for profile in profiles:
+            yield score_profile(car_file, profile, k, similar_k)
+    else:
+        yield from bounded_map(_ProfileScorer(car_file, k, similar_k), profiles, workers, 16 * workers,
+                               initializer=warm_up, initargs=(car_file,))
+
+
+class _ProfileScorer:
+    """A picklable function scoring one profile of a given car data file, used by the worker processes.
+
+    Instance Attributes:
+        - car_file: The path of the car data file.
+        - k: The number of ranked cars kept per profile, or None for every matching car.
+        - similar_k: The number of similar cars listed per profile.
+    """
+    car_file: str
+    k: Optional[int]
+    similar_k: int
+
+    def __init__(self, car_file: str, k: Optional[int], similar_k: int) -> None:
+        """Initialize a new scorer with the given settings."""
+        self.car_file = car_file
+        self.k = k
+        self.similar_k = similar_k
+
+    def __call__(self, profile: dict) -> dict:
+        """Return score_profile(self.car_file, profile, self.k, self.similar_k)."""
+        return score_profile(self.car_file, profile, self.k, self.similar_k)
+
+
+def write_results(results: Iterable[dict], output: TextIO) -> int:
+    """Write every result to output as one JSON line, and return the number of results written."""
+    count = 0
+    for result in results:
+        output.write(json.dumps(result) + '\n')
+        count += 1
+    return count
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Score the profile file given in the command line arguments."""
+    parser = argparse.ArgumentParser(description='Score a file of user profiles and write the results as JSONL.')
+    parser.add_argument('profiles', help='a CSV or JSONL file of profiles, or - to read JSONL from standard input')
+    parser.add_argument('--cars', default='car_data_set.csv', help='the car data file to score against')
+    parser.add_argument('--output', default='-', help='the JSONL file to write, or - for standard output')
+    parser.add_argument('--top', type=int, default=None, help='the number of ranked cars kept per profile')
+    parser.add_argument('--similar', type=int, default=5, help='the number of similar cars listed per profile')
+    parser.add_argument('--workers', type=int, default=1, help='the number of processes scoring profiles')
+    args = parser.parse_args(argv)
+
+    jsonl = args.profiles == '-' or args.profiles.endswith(('.jsonl', '.json'))
+    profile_file = sys.stdin if args.profiles == '-' else open(args.profiles, newline='', encoding='utf-8')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        results = score_profiles(args.cars, read_profiles(profile_file, jsonl), args.top, args.similar,
+                                 args.workers)
+        write_results(results, output)
+    except BrokenPipeError:
+        # The reader of standard output stopped reading, e.g. when the output is piped into head.
+        sys.stderr.close()
+    finally:
+        if profile_file is not sys.stdin:
+            profile_file.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['argparse', 'csv', 'json', 'sys', 'collections', 'concurrent.futures', 'typing',
+                          'queries'],
+        'allowed-io': ['main'],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
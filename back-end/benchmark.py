@@ -0,0 +1,318 @@
+"""CSC111 Winter 2024 Project: Car Recommender System
+
+Module Description
+==================
+This module contains the benchmark suite of the car recommender system. It generates synthetic car data files in
+the format of car_data_set.csv, then times every stage of the pipeline on them and measures the peak memory each
+stage allocates:
+    - building: finalize_all_data, build_decision_tree, car_dict, generate_car_dict and load_complete_graph, each
+      run from a cold start, with the shared catalog and decision tree caches cleared first
+    - querying: car_guesser, car_ranker and recommend_cars, each run on a batch of random queries once their data is
+      loaded, so only the queries themselves are timed
+
+The results are written as JSON, so two runs (for example, before and after a change) can be compared with
+compare_results. Stages that would take far too long at a given size, such as the complete graph, which grows
+quadratically, are recorded as skipped rather than run.
+
+Run this module to benchmark the default sizes, e.g.
+    python benchmark.py --rows 1000 10000 --output results.json
+    python benchmark.py --compare old.json results.json
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+import catalog
+import data_work
+import project_graphs
+import ranking
+import tree
+
+# The default numbers of rows of the generated car data files.
+DEFAULT_ROWS = [1000, 10000, 100000, 1000000]
+
+# The header row of car_data_set.csv.
+CSV_HEADER = ['Car Name', 'Engine', 'HP', 'Price', 'Torque', 'Car Type', 'Rating', 'Reliability', '0-60',
+              'Max Speed', 'Image Path']
+
+# The dropdown choices of the user interface, in the order of tree.car_guesser.
+ENGINE_CHOICES = ['V4', 'V6', 'V8', 'V10', 'V12', 'Electric']
+HP_CHOICES = ['0-449', '450-620', '620+']
+PRICE_CHOICES = ['$0-$49,999', '$50,000-$99,999', '$100,000-$199,999', '$200,000+']
+TORQUE_CHOICES = ['0-499', '500-750', '750+']
+CAR_TYPE_CHOICES = ['Sedan', 'SUV', 'Sports', 'Luxury']
+
+# The number of random queries run by each query stage.
+QUERIES = 100
+
+# The largest number of rows each stage is run on. Stages not listed here are run at every size.
+STAGE_LIMITS = {'load_complete_graph': 3000, 'recommend_cars': 3000}
+
+
+def generate_catalog(path: str, rows: int, seed: int = 0) -> None:
+    """Write a synthetic car data file with the given number of rows to path, in the format of car_data_set.csv.
+
+    Every attribute is drawn uniformly from roughly the range of the real data set, and the same seed always
+    produces the same file.
+    """
+    generator = np.random.default_rng(seed)
+    columns = [
+        [f'Car {i}' for i in range(rows)],
+        generator.choice(ENGINE_CHOICES, rows).tolist(),
+        generator.integers(169, 1021, rows).tolist(),
+        generator.integers(20000, 400001, rows).tolist(),
+        generator.integers(205, 1051, rows).tolist(),
+        generator.choice(CAR_TYPE_CHOICES, rows).tolist(),
+        np.round(generator.uniform(5, 10, rows), 1).tolist(),
+        np.round(generator.uniform(1, 5, rows), 1).tolist(),
+        np.round(generator.uniform(2, 11, rows), 1).tolist(),
+        generator.integers(170, 341, rows).tolist(),
+        [f'car_images/car{i}' for i in range(rows)]
+    ]
+
+    with open(path, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(zip(*columns))
+
+
+def catalog_file(directory: str, rows: int, seed: int = 0) -> str:
+    """Return the path of the synthetic car data file with the given number of rows and seed in directory,
+    generating it only if it does not exist yet.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'cars_{rows}_{seed}.csv')
+    if not os.path.isfile(path):
+        generate_catalog(path, rows, seed)
+    return path
+
+
+def random_profiles(count: int, seed: int = 0) -> list[tuple[list[str], list[str]]]:
+    """Return count random user profiles: a list of the five dropdown choices and a list of the four slider values.
+    """
+    generator = np.random.default_rng(seed)
+    choices = [ENGINE_CHOICES, HP_CHOICES, PRICE_CHOICES, TORQUE_CHOICES, CAR_TYPE_CHOICES]
+    return [([str(generator.choice(options)) for options in choices],
+             [str(weight) for weight in generator.integers(0, 101, 4).tolist()]) for _ in range(count)]
+
+
+def clear_caches() -> None:
+    """Forget every catalog and decision tree loaded by this process, so the next stage starts cold."""
+    catalog._loaded_catalogs.clear()
+    tree._decision_trees.clear()
+    gc.collect()
+
+
+def _setup_cold(car_file: str) -> str:
+    """Prepare a building stage: clear every cache, and return car_file."""
+    clear_caches()
+    return car_file
+
+
+def _setup_guesser(car_file: str) -> tuple[str, list]:
+    """Prepare the car_guesser stage: load the decision tree, and return car_file and the queries."""
+    tree.load_decision_tree(car_file)
+    return car_file, random_profiles(QUERIES)
+
+
+def _setup_ranker(car_file: str) -> tuple[list, dict, dict]:
+    """Prepare the car_ranker stage: return the queries, with the cars matching each one, the car dictionary and
+    the performance bounds of the catalog.
+    """
+    all_cars = tree.car_dict(car_file)
+    queries = []
+    for preferences, weights in random_profiles(QUERIES):
+        queries.append((weights, tree.car_guesser(car_file, preferences) or list(all_cars)[:1]))
+    return queries, all_cars, ranking.performance_bounds(catalog.load_catalog(car_file))
+
+
+def _setup_recommend(car_file: str) -> tuple[project_graphs.WeightedGraph, list[str]]:
+    """Prepare the recommend_cars stage: return the complete graph and the cars to recommend from."""
+    graph = project_graphs.load_complete_graph(car_file)
+    names = catalog.load_catalog(car_file).names
+    generator = np.random.default_rng(0)
+    return graph, [names[i] for i in generator.integers(0, len(names), QUERIES).tolist()]
+
+
+def _run_guesser(state: tuple[str, list]) -> int:
+    """Run every car_guesser query, and return the number of queries."""
+    car_file, profiles = state
+    for preferences, _ in profiles:
+        tree.car_guesser(car_file, preferences)
+    return len(profiles)
+
+
+def _run_ranker(state: tuple[list, dict, dict]) -> int:
+    """Run every car_ranker query, and return the number of queries."""
+    queries, all_cars, bounds = state
+    for weights, cars in queries:
+        tree.car_ranker(weights, cars, all_cars, bounds=bounds)
+    return len(queries)
+
+
+def _run_recommend(state: tuple[project_graphs.WeightedGraph, list[str]]) -> int:
+    """Run every recommend_cars query, and return the number of queries."""
+    graph, cars = state
+    for car in cars:
+        graph.recommend_cars(car)
+    return len(cars)
+
+
+# Maps the name of every stage to the function preparing its input from a car data file, which is not measured,
+# and the function running the stage on that input, which returns the number of operations it did.
+STAGES: dict[str, tuple[Callable[[str], Any], Callable[[Any], Any]]] = {
+    'finalize_all_data': (_setup_cold, data_work.finalize_all_data),
+    'build_decision_tree': (_setup_cold, tree.build_decision_tree),
+    'car_dict': (_setup_cold, tree.car_dict),
+    'car_guesser': (_setup_guesser, _run_guesser),
+    'car_ranker': (_setup_ranker, _run_ranker),
+    'generate_car_dict': (_setup_cold, project_graphs.generate_car_dict),
+    'load_complete_graph': (_setup_cold, project_graphs.load_complete_graph),
+    'recommend_cars': (_setup_recommend, _run_recommend)
+}
+
+
+def measure(stage: str, car_file: str, rows: int, repeats: int = 1) -> dict:
+    """Run the given stage on car_file, which has the given number of rows, and return its result record.
+
+    The record holds the fastest time of the given number of repeats, the number of operations of one run and the
+    peak memory allocated by one run, in bytes, as traced by tracemalloc. A stage over its limit in STAGE_LIMITS is
+    not run, and its record says it was skipped.
+
+    Preconditions:
+        - stage in STAGES
+        - repeats > 0
+    """
+    record = {'stage': stage, 'rows': rows}
+    if rows > STAGE_LIMITS.get(stage, rows):
+        record['skipped'] = f'more than {STAGE_LIMITS[stage]} rows'
+        return record
+
+    setup, run = STAGES[stage]
+    times = []
+    for _ in range(repeats):
+        state = setup(car_file)
+        start = time.perf_counter()
+        result = run(state)
+        times.append(time.perf_counter() - start)
+        del result
+
+    state = setup(car_file)
+    tracemalloc.start()
+    result = run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    operations = result if isinstance(result, int) else 1
+    record.update({'seconds': min(times), 'operations': operations, 'seconds_per_operation': min(times) / operations,
+                   'peak_bytes': peak})
+    return record
+
+
+def run_benchmarks(rows: list[int], stages: Optional[list[str]] = None, repeats: int = 1,
+                   data_directory: str = '.benchmark_data', log: Optional[Callable[[dict], None]] = None) -> dict:
+    """Run the given stages (every stage if None) on a synthetic car data file of every given size, and return the
+    results, along with a description of the machine they were measured on.
+
+    If log is given, it is called with each record as soon as it is measured.
+    """
+    results = []
+    for size in rows:
+        car_file = catalog_file(data_directory, size)
+        for stage in stages or list(STAGES):
+            record = measure(stage, car_file, size, repeats)
+            results.append(record)
+            if log is not None:
+                log(record)
+        clear_caches()
+
+    return {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'repeats': repeats,
+        'results': results
+    }
+
+
+def compare_results(old: dict, new: dict) -> list[dict]:
+    """Return the change between two runs of run_benchmarks, for every stage and size measured in both.
+
+    A ratio below 1 means the new run was faster, or used less memory.
+    """
+    old_records = {(record['stage'], record['rows']): record for record in old['results'] if 'seconds' in record}
+    changes = []
+    for record in new['results']:
+        before = old_records.get((record['stage'], record['rows']))
+        if before is not None and 'seconds' in record:
+            changes.append({
+                'stage': record['stage'],
+                'rows': record['rows'],
+                'time_ratio': record['seconds'] / before['seconds'] if before['seconds'] else None,
+                'memory_ratio': record['peak_bytes'] / before['peak_bytes'] if before['peak_bytes'] else None
+            })
+    return changes
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run the benchmarks, or compare two result files, as given in the command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark every stage of the car recommender pipeline.')
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS, help='the catalog sizes to run')
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=None, help='the stages to run')
+    parser.add_argument('--repeats', type=int, default=1, help='the number of timed runs of each stage')
+    parser.add_argument('--data-dir', default='.benchmark_data', help='where the synthetic catalogs are kept')
+    parser.add_argument('--output', default='-', help='the JSON file to write the results to, or - for stdout')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two result files instead')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.compare:
+            with open(args.compare[0]) as old_file, open(args.compare[1]) as new_file:
+                changes = compare_results(json.load(old_file), json.load(new_file))
+            for change in changes:
+                print(json.dumps(change))
+            return
+
+        results = run_benchmarks(args.rows, args.stages, args.repeats, args.data_dir,
+                                 lambda record: print(json.dumps(record), file=sys.stderr))
+        if args.output == '-':
+            print(json.dumps(results, indent=2))
+        else:
+            with open(args.output, 'w') as output_file:
+                json.dump(results, output_file, indent=2)
+    except BrokenPipeError:
+        # The reader of standard output stopped reading, e.g. when the output is piped into head.
+        sys.stderr.close()
+
+
+if __name__ == '__main__':
+    main()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['argparse', 'csv', 'datetime', 'gc', 'json', 'os', 'platform', 'sys', 'time',
+                          'tracemalloc', 'typing', 'numpy', 'catalog', 'data_work', 'project_graphs', 'ranking',
+                          'tree'],
+        'allowed-io': ['generate_catalog', 'main'],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
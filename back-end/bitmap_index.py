@@ -0,0 +1,188 @@
+"""CSC111 Winter 2024 Project: Car Recommendation and Ranking System
+
+Module Description
+==================
+This module contains a bitmap index, an alternative to the decision tree in tree.py for filtering cars by their
+encoded attributes. The decision tree can only follow one exact path of engine, horsepower, price, torque and car
+type, so every preference has to be chosen and can only have one value. The bitmap index instead keeps one bitset
+per value of each encoded attribute, where bit i is set when the car in row i of the catalog has that value.
+
+A query combines these bitsets: the values allowed for one attribute are combined with OR, and the attributes are
+combined with AND. This makes looser queries such as "any engine", "V8 or V12" or "price in the first two ranges"
+as cheap as an exact one. Bitsets are stored as Python integers, so each OR and AND works on whole machine words.
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+
+from catalog import Catalog, load_catalog
+import tree
+
+# The encoded attributes of the index, in the same order as the levels of the decision tree.
+DIMENSIONS = ['engine', 'hp', 'price', 'torque', 'car_type']
+
+# The functions encoding a user's choice for each attribute, in the same order as DIMENSIONS.
+PREFERENCE_ENCODERS = [tree.encode_engine, tree.encode_hp2, tree.encode_price2, tree.encode_torque2,
+                       tree.encode_car_type]
+
+
+class BitmapIndex:
+    """A bitmap index over the encoded engine, horsepower, price, torque and car type of every car in a catalog.
+
+    Instance Attributes:
+        - names: The car names. Bit i of every bitset belongs to names[i].
+        - version: The version of the catalog this index was built from.
+
+    Representation Invariants:
+        - set(self._bitmaps) == set(DIMENSIONS)
+        - all(sum(bin(bits).count('1') for bits in self._bitmaps[d].values()) == len(self.names) for d in DIMENSIONS)
+    """
+    names: list[str]
+    version: str
+
+    # Private Instance Attributes:
+    #     - _bitmaps: Maps each dimension to a dictionary mapping each encoded value to its bitset.
+    #     - _all: The bitset with the bit of every car set.
+    _bitmaps: dict[str, dict[int, int]]
+    _all: int
+
+    def __init__(self, catalog: Catalog) -> None:
+        """Initialize a new bitmap index over every car in catalog."""
+        self.names = catalog.names
+        self.version = catalog.version
+        self._all = _to_bitset(np.arange(len(catalog)), len(catalog))
+
+        columns = {
+            'engine': [tree.encode_engine(engine) for engine in catalog.engine],
+            'hp': [tree.encode_hp(hp) for hp in catalog.hp.tolist()],
+            'price': [tree.encode_price(price) for price in catalog.price.tolist()],
+            'torque': [tree.encode_torque(torque) for torque in catalog.torque.tolist()],
+            'car_type': [tree.encode_car_type(car_type) for car_type in catalog.car_type]
+        }
+
+        self._bitmaps = {}
+        for dimension, codes in columns.items():
+            codes = np.array(codes)
+            self._bitmaps[dimension] = {int(code): _to_bitset(np.flatnonzero(codes == code), len(codes))
+                                        for code in np.unique(codes)}
+
+    def matching(self, dimension: str, codes: Optional[Iterable[int]] = None) -> int:
+        """Return the bitset of the cars whose encoded value for dimension is one of codes.
+
+        If codes is None, every car matches.
+
+        Preconditions:
+            - dimension in DIMENSIONS
+        """
+        if codes is None:
+            return self._all
+
+        bits = 0
+        for code in codes:
+            bits |= self._bitmaps[dimension].get(code, 0)
+        return bits
+
+    def query_bits(self, engine: Optional[Iterable[int]] = None, hp: Optional[Iterable[int]] = None,
+                   price: Optional[Iterable[int]] = None, torque: Optional[Iterable[int]] = None,
+                   car_type: Optional[Iterable[int]] = None) -> int:
+        """Return the bitset of the cars matching every given dimension.
+
+        Each argument is the collection of encoded values allowed for that dimension, or None to allow any value.
+        For example, price=range(1, 3) allows the first two price ranges.
+        """
+        bits = self._all
+        for dimension, codes in zip(DIMENSIONS, [engine, hp, price, torque, car_type]):
+            if codes is not None:
+                bits &= self.matching(dimension, codes)
+        return bits
+
+    def query(self, engine: Optional[Iterable[int]] = None, hp: Optional[Iterable[int]] = None,
+              price: Optional[Iterable[int]] = None, torque: Optional[Iterable[int]] = None,
+              car_type: Optional[Iterable[int]] = None) -> list[str]:
+        """Return the names of the cars matching every given dimension, in catalog order and without duplicates.
+
+        The arguments have the same meaning as in query_bits.
+        """
+        rows = _from_bitset(self.query_bits(engine, hp, price, torque, car_type), len(self.names))
+        return list(dict.fromkeys(self.names[i] for i in rows.tolist()))
+
+    def count(self, engine: Optional[Iterable[int]] = None, hp: Optional[Iterable[int]] = None,
+              price: Optional[Iterable[int]] = None, torque: Optional[Iterable[int]] = None,
+              car_type: Optional[Iterable[int]] = None) -> int:
+        """Return the number of catalog rows matching every given dimension, without listing them.
+
+        The arguments have the same meaning as in query_bits.
+        """
+        return bin(self.query_bits(engine, hp, price, torque, car_type)).count('1')
+
+
+def _to_bitset(rows: np.ndarray, size: int) -> int:
+    """Return the bitset of the given rows, out of size rows."""
+    bits = np.zeros(size, dtype=bool)
+    bits[rows] = True
+    return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+
+
+def _from_bitset(bits: int, size: int) -> np.ndarray:
+    """Return the rows whose bit is set in the given bitset, out of size rows, in increasing order."""
+    packed = np.frombuffer(bits.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(packed, bitorder='little')[:size])
+
+
+def encode_choices(choice: Any, encoder: Callable[[str], int]) -> Optional[list[int]]:
+    """Return the encoded values allowed by a user's choice for one attribute.
+
+    The choice is 'x' or None for any value, a single string such as 'V8', or a list of strings such as
+    ['V8', 'V12'].
+    """
+    if choice is None or choice == 'x':
+        return None
+    elif isinstance(choice, str):
+        return [encoder(choice)]
+    else:
+        return [encoder(value) for value in choice]
+
+
+def car_filter(car_file: str, preferences: list) -> list[str]:
+    """
+    Return the cars matching a list of looser user preferences, using a bitmap index instead of the decision tree.
+
+    The preferences are in the same order as for tree.car_guesser (engine, horsepower, price, torque and car type),
+    but each one can also be 'x' for any value or a list of the values the user accepts.
+    With five single values, the result is the same as car_guesser(car_file, preferences). For example,
+    ['x', ['450-620', '620+'], 'x', 'x', 'Sports'] asks for any sports car with at least 450 horsepower.
+    """
+    index = load_bitmap_index(car_file)
+    codes = [encode_choices(choice, encoder) for choice, encoder in zip(preferences, PREFERENCE_ENCODERS)]
+    return index.query(*codes)
+
+
+# Maps the absolute path of each car data file to the bitmap index built from it.
+_indexes: dict[str, BitmapIndex] = {}
+
+
+def load_bitmap_index(car_file: str) -> BitmapIndex:
+    """Return the bitmap index of the given car data file, building it only once per version of the file."""
+    path = os.path.abspath(car_file)
+    catalog = load_catalog(path)
+    if path not in _indexes or _indexes[path].version != catalog.version:
+        _indexes[path] = BitmapIndex(catalog)
+    return _indexes[path]
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['os', 'typing', 'numpy', 'catalog', 'tree'],  # the names (strs) of imported modules
+        'allowed-io': [],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
@@ -0,0 +1,277 @@
+"""CSC111 Winter 2024 Project: Car Recommender System
+
+Module Description
+==================
+This module contains the in-memory car catalog shared by the decision tree (tree.py), the similarity graph
+(project_graphs.py) and the data preprocessing functions (data_work.py). The catalog parses a CSV file in the format
+of car_data_set.csv exactly once and stores every attribute as a typed column, so that every part of the system
+reads the same parsed data instead of opening and converting the file again.
+
+Catalogs are loaded through load_catalog, which keeps the most recently parsed catalog for each file and only parses
+the file again when it has changed on disk.
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import os
+from typing import Any, Optional
+
+import numpy as np
+
+import metrics
+
+# The names of the columns of a catalog, in the same order as the columns of car_data_set.csv.
+CATALOG_COLUMNS = ['names', 'engine', 'hp', 'price', 'torque', 'car_type', 'rating', 'reliability',
+                   'zero_to_sixty', 'max_speed', 'image_path']
+
+
+# The columns of a catalog holding numbers, which have summary statistics.
+NUMERIC_COLUMNS = ['hp', 'price', 'torque', 'rating', 'reliability', 'zero_to_sixty', 'max_speed']
+
+# The percentiles recorded in the summary statistics of each numeric column.
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+class ColumnStats:
+    """Summary statistics of one numeric column of a catalog.
+
+    Instance Attributes:
+        - minimum: The smallest value in the column.
+        - maximum: The largest value in the column.
+        - mean: The mean of the column.
+        - percentiles: Maps each percentile in PERCENTILES to its value in the column.
+
+    Representation Invariants:
+        - self.minimum <= self.mean <= self.maximum
+    """
+    minimum: float
+    maximum: float
+    mean: float
+    percentiles: dict[int, float]
+
+    def __init__(self, minimum: float, maximum: float, mean: float, percentiles: dict[int, float]) -> None:
+        """Initialize new column statistics with the given values."""
+        self.minimum = minimum
+        self.maximum = maximum
+        self.mean = mean
+        self.percentiles = percentiles
+
+    @classmethod
+    def of(cls, values: np.ndarray) -> ColumnStats:
+        """Return the statistics of the given non-empty column."""
+        percentiles = np.percentile(values, PERCENTILES).tolist()
+        return cls(values.min().item(), values.max().item(), values.mean().item(),
+                   dict(zip(PERCENTILES, percentiles)))
+
+    def bounds(self) -> tuple[float, float]:
+        """Return the (minimum, maximum) of the column."""
+        return self.minimum, self.maximum
+
+    def to_dict(self) -> dict:
+        """Return these statistics as a dictionary that can be saved as JSON."""
+        return {'min': self.minimum, 'max': self.maximum, 'mean': self.mean,
+                'percentiles': {str(p): value for p, value in self.percentiles.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ColumnStats:
+        """Return the statistics saved by to_dict."""
+        return cls(data['min'], data['max'], data['mean'],
+                   {int(p): value for p, value in data['percentiles'].items()})
+
+
+class Catalog:
+    """A columnar, read-only collection of every car stored in a car data CSV file.
+
+    Row i of the catalog is the i-th data row of the file, and every column below has one entry per row.
+
+    Instance Attributes:
+        - names: The car model names.
+        - engine: The engine types, e.g. 'V8' or 'Electric'.
+        - hp: The horsepower of each car.
+        - price: The price of each car, in dollars.
+        - torque: The torque of each car.
+        - car_type: The car types, e.g. 'Sedan' or 'SUV'.
+        - rating: The certified rating score of each car, out of 10.
+        - reliability: The certified reliability score of each car, out of 5.
+        - zero_to_sixty: The 0-60 mph time of each car, in seconds.
+        - max_speed: The max speed of each car, in mph.
+        - image_path: The image path of each car, without the '.jpg' extension.
+        - version: A hash of the file contents this catalog was parsed from.
+
+    Representation Invariants:
+        - all(len(column) == len(self.names) for column in the columns listed above)
+    """
+    names: list[str]
+    engine: list[str]
+    hp: np.ndarray
+    price: np.ndarray
+    torque: np.ndarray
+    car_type: list[str]
+    rating: np.ndarray
+    reliability: np.ndarray
+    zero_to_sixty: np.ndarray
+    max_speed: np.ndarray
+    image_path: list[str]
+    version: str
+
+    # Private Instance Attributes:
+    #     - _index: Maps each car name to the row it is stored in. When a name appears more than once,
+    #               the last row wins, the same as when the rows are read into a dictionary.
+    #     - _stats: The statistics of every numeric column, or None if they have not been computed yet.
+    _index: dict[str, int]
+    _stats: Optional[dict[str, ColumnStats]]
+
+    def __init__(self, rows: list[list[str]], version: str) -> None:
+        """Initialize a new catalog from the given data rows (the header row excluded).
+
+        Preconditions:
+            - every row in rows has the 11 columns of car_data_set.csv
+        """
+        self.names = [row[0] for row in rows]
+        self.engine = [row[1] for row in rows]
+        self.hp = np.array([int(row[2]) for row in rows], dtype=np.int64)
+        self.price = np.array([int(row[3]) for row in rows], dtype=np.int64)
+        self.torque = np.array([int(row[4]) for row in rows], dtype=np.int64)
+        self.car_type = [row[5] for row in rows]
+        self.rating = np.array([float(row[6]) for row in rows], dtype=np.float64)
+        self.reliability = np.array([float(row[7]) for row in rows], dtype=np.float64)
+        self.zero_to_sixty = np.array([float(row[8]) for row in rows], dtype=np.float64)
+        self.max_speed = np.array([int(row[9]) for row in rows], dtype=np.int64)
+        self.image_path = [row[10] for row in rows]
+        self.version = version
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._stats = None
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, Any], version: str,
+                     stats: Optional[dict[str, ColumnStats]] = None) -> Catalog:
+        """Return a new catalog holding the given, already typed columns, without parsing any rows.
+
+        columns maps the name of every column listed in the class docstring (except version) to its values. The
+        numeric columns may be read-only arrays, such as arrays memory-mapped from a snapshot file. If stats is
+        given, it must be the statistics of these columns, and they are not computed again.
+        """
+        catalog = cls([], version)
+        for column in CATALOG_COLUMNS:
+            setattr(catalog, column, columns[column])
+        catalog._index = {name: i for i, name in enumerate(catalog.names)}
+        catalog._stats = stats
+        return catalog
+
+    def stats(self) -> dict[str, ColumnStats]:
+        """Return the statistics of every numeric column of this catalog, computing them the first time.
+
+        The statistics are empty when the catalog has no rows.
+        """
+        if self._stats is None:
+            if len(self) == 0:
+                self._stats = {}
+            else:
+                self._stats = {column: ColumnStats.of(getattr(self, column)) for column in NUMERIC_COLUMNS}
+        return self._stats
+
+    def __len__(self) -> int:
+        """Return the number of rows in this catalog."""
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        """Return whether a car with the given name is in this catalog."""
+        return name in self._index
+
+    def index_of(self, name: str) -> int:
+        """Return the row of the car with the given name.
+
+        Raise a KeyError if no car has the given name.
+        """
+        return self._index[name]
+
+    def attributes(self, i: int) -> list:
+        """Return the attributes of the car in row i, in the same order as the values of car_dict.
+
+        The order is: rating, reliability, zero to sixty, max speed, image path, engine, horsepower, price,
+        torque and car type.
+        """
+        return [
+            float(self.rating[i]),
+            float(self.reliability[i]),
+            float(self.zero_to_sixty[i]),
+            int(self.max_speed[i]),
+            self.image_path[i],
+            self.engine[i],
+            int(self.hp[i]),
+            int(self.price[i]),
+            int(self.torque[i]),
+            self.car_type[i]
+        ]
+
+
+# Maps the absolute path of each loaded file to ((modification time, size), catalog).
+_loaded_catalogs: dict[str, tuple[tuple[int, int], Catalog]] = {}
+
+
+def parse_catalog(file: str) -> Catalog:
+    """Parse the given car data file into a new catalog, without using or updating the shared catalogs.
+
+    Preconditions:
+        - file is the path to a csv file in the format of the car_data_set.csv
+    """
+    with metrics.span('csv_parse'):
+        with open(file, 'rb') as csv_file:
+            contents = csv_file.read()
+
+        reader = csv.reader(io.StringIO(contents.decode('utf-8')))
+        next(reader)
+        rows = [row for row in reader if row]
+        catalog = Catalog(rows, hashlib.sha1(contents).hexdigest())
+
+    metrics.count('rows_parsed', len(rows))
+    return catalog
+
+
+def register_catalog(file: str, catalog: Catalog) -> None:
+    """Make load_catalog(file) return the given catalog until the file changes, without parsing the file.
+
+    Preconditions:
+        - catalog holds the current contents of file
+    """
+    path = os.path.abspath(file)
+    stat = os.stat(path)
+    _loaded_catalogs[path] = ((stat.st_mtime_ns, stat.st_size), catalog)
+
+
+def load_catalog(file: str) -> Catalog:
+    """Return the catalog of the given car data file, parsing the file only if it has not been parsed before or
+    has changed since it was last parsed.
+
+    The returned catalog is shared by every caller, so it must not be mutated.
+
+    Preconditions:
+        - file is the path to a csv file in the format of the car_data_set.csv
+    """
+    path = os.path.abspath(file)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    if path in _loaded_catalogs and _loaded_catalogs[path][0] == key:
+        return _loaded_catalogs[path][1]
+
+    catalog = parse_catalog(path)
+    _loaded_catalogs[path] = (key, catalog)
+    return catalog
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['csv', 'hashlib', 'io', 'os', 'typing', 'numpy', 'metrics'],
+        'allowed-io': ['parse_catalog'],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
@@ -7,6 +7,10 @@ functions for normalizing numerical data, one-hot encoding categorical data and
 irrelevant columns. The processed data is used in the Car Recommender System to analyze
 and recommend cars based on user preferences.
 
+For files too large to hold in memory, stream_normalized_data reads the CSV file in fixed-size
+chunks and yields the normalized attributes chunk by chunk, using a first pass over the file to
+find the bounds used for normalization.
+
 Copyright and Usage Information
 ===============================
 
@@ -15,105 +19,112 @@ Copyright and Usage Information
 This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali
 """
 import csv
+import itertools
+from typing import Iterator, Optional
+
+import numpy as np
+
+from catalog import Catalog, load_catalog
+
+
+class CategoricalEncoder:
+    """
+    A one-hot encoder for one categorical attribute, such as the car type or the engine type.
+
+    The encoder either starts from a fixed list of categories or learns its categories from the data, in order of
+    first appearance. Values are first turned into integer codes, which are the sparse form of the encoding (row i
+    has a single 1, in column codes[i]). The dense form is a uint8 matrix with one column per category, built from
+    the codes in one vectorized step.
+
+    Instance Attributes:
+        - categories: The known categories. Category categories[j] has code j and is column j of the dense form.
+        - learn: Whether values that are not yet known are added as new categories. If not, they are encoded as a
+          row of zeros.
+
+    Representation Invariants:
+        - len(self.categories) == len(set(self.categories))
+    """
+    categories: list[str]
+    learn: bool
+
+    # Private Instance Attributes:
+    #     - _codes: Maps each category to its code.
+    _codes: dict[str, int]
+
+    def __init__(self, categories: Optional[list[str]] = None, learn: bool = True) -> None:
+        """Initialize a new encoder knowing the given categories, or no categories if categories is None."""
+        self.categories = []
+        self.learn = learn
+        self._codes = {}
+        for category in categories or []:
+            self._add(category)
+
+    def _add(self, category: str) -> int:
+        """Add category to the known categories and return its code."""
+        self._codes[category] = len(self.categories)
+        self.categories.append(category)
+        return self._codes[category]
+
+    def codes(self, values: list[str]) -> np.ndarray:
+        """Return the code of each value. Unknown values are learned, or given the code len(self.categories) if
+        this encoder does not learn.
+        """
+        unknown = len(self.categories)
+        codes = []
+        for value in values:
+            code = self._codes.get(value)
+            if code is None:
+                code = self._add(value) if self.learn else unknown
+            codes.append(code)
+        return np.array(codes, dtype=np.int64)
+
+    def dense(self, values: list[str]) -> np.ndarray:
+        """Return the one-hot encoding of values as a uint8 matrix with one row per value and one column per
+        category.
+        """
+        codes = self.codes(values)
+        matrix = np.zeros((len(codes), len(self.categories) + 1), dtype=np.uint8)
+        matrix[np.arange(len(codes)), codes] = 1
+        return matrix[:, :len(self.categories)]
+
+
+# The categories one-hot encoded by create_full_data, in the order of its lists.
+LEGACY_CAR_TYPES = ['Sedan', 'SUV', 'Sports', 'Luxury']
+LEGACY_ENGINES = ['V4', 'V6', 'V8', 'V12', 'Electric']
 
 
 def create_full_data(dataset: str) -> tuple:
     """
     Read car data from a CSV file and return a tuple containing raw car attributes and one-hot encoded features.
 
+    The one-hot encoded features are the lists is_sedan, is_suv, is_sports, is_luxury, is_v4, is_v6, is_v8, is_v12
+    and is_electric. Any other car type or engine type is encoded as all zeros.
+
     Preconditions:
     - dataset is the path to a CSV file that is properly formatted with car attributes.
     - The CSV file must include headers.
     - The car type must be the 6th column and engine type must be the 2nd column in the CSV.
     """
-
-    is_sedan = []
-    is_suv = []
-    is_sports = []
-    is_luxury = []
-
-    is_v4 = []
-    is_v6 = []
-    is_v8 = []
-    is_v12 = []
-    is_electric = []
-
-    one_hot_encoded_list = [is_sedan, is_suv, is_sports, is_luxury, is_v4, is_v6, is_v8, is_v12, is_electric]
-
-    full_list = []
-
     with open(dataset, 'r') as file:
         reader = csv.reader(file)
         next(reader)
-        for row in reader:
-            if row[5] == 'Sedan':
-                is_sedan.append(1)
-                is_suv.append(0)
-                is_sports.append(0)
-                is_luxury.append(0)
-            elif row[5] == 'SUV':
-                is_sedan.append(0)
-                is_suv.append(1)
-                is_sports.append(0)
-                is_luxury.append(0)
-            elif row[5] == 'Sports':
-                is_sedan.append(0)
-                is_suv.append(0)
-                is_sports.append(1)
-                is_luxury.append(0)
-            elif row[5] == 'Luxury':
-                is_sedan.append(0)
-                is_suv.append(0)
-                is_sports.append(0)
-                is_luxury.append(1)
-            else:
-                is_sedan.append(0)
-                is_suv.append(0)
-                is_sports.append(0)
-                is_luxury.append(0)
-
-            if row[1] == 'V4':
-                is_v4.append(1)
-                is_v6.append(0)
-                is_v8.append(0)
-                is_v12.append(0)
-                is_electric.append(0)
-            elif row[1] == 'V6':
-                is_v4.append(0)
-                is_v6.append(1)
-                is_v8.append(0)
-                is_v12.append(0)
-                is_electric.append(0)
-            elif row[1] == 'V8':
-                is_v4.append(0)
-                is_v6.append(0)
-                is_v8.append(1)
-                is_v12.append(0)
-                is_electric.append(0)
-            elif row[1] == 'V12':
-                is_v4.append(0)
-                is_v6.append(0)
-                is_v8.append(0)
-                is_v12.append(1)
-                is_electric.append(0)
-            elif row[1] == 'Electric':
-                is_v4.append(0)
-                is_v6.append(0)
-                is_v8.append(0)
-                is_v12.append(0)
-                is_electric.append(1)
-            else:
-                is_v4.append(0)
-                is_v6.append(0)
-                is_v8.append(0)
-                is_v12.append(0)
-                is_electric.append(0)
+        full_list = list(reader)
 
-            full_list.append(row)
+    car_types = CategoricalEncoder(LEGACY_CAR_TYPES, learn=False).dense([row[5] for row in full_list])
+    engines = CategoricalEncoder(LEGACY_ENGINES, learn=False).dense([row[1] for row in full_list])
+    one_hot_encoded_list = car_types.T.tolist() + engines.T.tolist()
 
     return full_list, one_hot_encoded_list
 
 
+# The attribute held by each list returned by complete_specific_data and catalog_specific_data.
+SPECIFIC_COLUMNS = ['names', 'engine', 'hp', 'price', 'torque', 'car_type', 'rating', 'reliability', 'zero_to_sixty',
+                    'max_speed', 'image_path']
+
+# The lists of complete_specific_data kept by finalize_all_data, before the one-hot encoded lists.
+FEATURE_COLUMNS = ['names', 'hp', 'price', 'torque', 'rating', 'reliability', 'zero_to_sixty', 'max_speed']
+
+
 def complete_specific_data(dataset: list) -> list:
     """
     Creates a list of lists, each containing all instances of a specific attribute across all cars.
@@ -147,42 +158,181 @@ def complete_specific_data(dataset: list) -> list:
     return indicators
 
 
-def normalize_specific_data(indi: list[list]) -> None:
+def normalize_specific_data(indi: list[list], bounds: Optional[list[Optional[tuple]]] = None) -> None:
     """
     Normalize the numerical data in each list of a list of lists in-place.
+
+    If bounds is given, bounds[j] is the (min, max) of indi[j], or None to compute it from indi[j].
     """
-    for ind in indi:
+    for j, ind in enumerate(indi):
         if isinstance(ind[0], float):
-            minim = min(ind)
-            maxim = max(ind)
+            if bounds is not None and bounds[j] is not None:
+                minim, maxim = bounds[j]
+            else:
+                minim = min(ind)
+                maxim = max(ind)
             for i in range(len(ind)):
                 ind[i] = (ind[i] - minim) / (maxim - minim)
 
 
+def catalog_specific_data(catalog: Catalog) -> list:
+    """
+    Return the same list of lists as complete_specific_data, built from the columns of an already parsed catalog
+    instead of from raw CSV rows.
+    """
+    return [
+        list(catalog.names),
+        list(catalog.engine),
+        catalog.hp.astype(float).tolist(),
+        catalog.price.astype(float).tolist(),
+        catalog.torque.astype(float).tolist(),
+        list(catalog.car_type),
+        catalog.rating.tolist(),
+        catalog.reliability.tolist(),
+        catalog.zero_to_sixty.tolist(),
+        catalog.max_speed.astype(float).tolist(),
+        list(catalog.image_path)
+    ]
+
+
+def catalog_bounds(catalog: Catalog) -> list[Optional[tuple]]:
+    """
+    Return the (min, max) of each list returned by catalog_specific_data, taken from the statistics the catalog
+    computes once, or None for the lists that are not numerical.
+    """
+    stats = catalog.stats()
+    return [stats[column].bounds() if column in stats else None for column in SPECIFIC_COLUMNS]
+
+
 def finalize_all_data(dataset: str) -> list:
     """
     Finalize car data by combining all attributes and one-hot encoded lists into a single list.
 
+    The list holds the car names, then the normalized columns in FEATURE_COLUMNS, then one one-hot encoded list for
+    every car type and every engine type found in the data, in order of first appearance.
+
     Preconditions:
     - dataset is the path to a CSV file that is properly formatted with car attributes.
     - The CSV file must include headers and be compatible with create_full_data and complete_specific_data functions
+
+    The file is read through the shared catalog, so it is only parsed again if it has changed.
     """
-    full_data = create_full_data(dataset)
-    indicators = complete_specific_data(full_data[0])
-    normalize_specific_data(indicators)
-    final_indicators = indicators + full_data[1]  # This is the one hot encoded list added to the indicators list.
-    del final_indicators[1]
-    del final_indicators[4]
-    del final_indicators[8]
+    catalog = load_catalog(dataset)
+    indicators = catalog_specific_data(catalog)
+    normalize_specific_data(indicators, catalog_bounds(catalog))
+    columns = dict(zip(SPECIFIC_COLUMNS, indicators))
+
+    car_types = CategoricalEncoder().dense(catalog.car_type)
+    engines = CategoricalEncoder().dense(catalog.engine)
+    final_indicators = [columns[column] for column in FEATURE_COLUMNS] + car_types.T.tolist() + engines.T.tolist()
 
     return final_indicators
 
 
+# The numerical columns of a streamed block, in the same order as they appear in finalize_all_data.
+STREAM_NUMERIC_COLUMNS = ['hp', 'price', 'torque', 'rating', 'reliability', 'zero_to_sixty', 'max_speed']
+
+# The CSV column holding each numerical column of a streamed block.
+STREAM_CSV_COLUMNS = {'hp': 2, 'price': 3, 'torque': 4, 'rating': 6, 'reliability': 7, 'zero_to_sixty': 8,
+                      'max_speed': 9}
+
+
+def iter_row_chunks(dataset: str, chunk_size: int = 10000) -> Iterator[list[list[str]]]:
+    """
+    Read the data rows of a CSV file lazily, yielding them in lists of at most chunk_size rows.
+
+    Preconditions:
+    - dataset is the path to a CSV file that is properly formatted with car attributes.
+    - chunk_size > 0
+    """
+    with open(dataset, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        next(reader)
+        while True:
+            chunk = [row for row in itertools.islice(reader, chunk_size) if row]
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_column_blocks(dataset: str, encoders: dict[str, CategoricalEncoder],
+                       chunk_size: int = 10000) -> Iterator[dict]:
+    """
+    Read a CSV file in chunks and yield each chunk as a block of typed columns.
+
+    Each block maps 'names' to a list of car names, each column in STREAM_NUMERIC_COLUMNS to a float64 array, and
+    'engine' and 'car_type' to int32 arrays of category codes from encoders['engine'] and encoders['car_type'],
+    which learn new categories as they are found.
+
+    Preconditions:
+    - dataset is the path to a CSV file that is properly formatted with car attributes.
+    - chunk_size > 0
+    """
+    for chunk in iter_row_chunks(dataset, chunk_size):
+        block = {'names': [row[0] for row in chunk]}
+        for column, index in STREAM_CSV_COLUMNS.items():
+            block[column] = np.array([float(row[index]) for row in chunk], dtype=np.float64)
+        for column, index in [('engine', 1), ('car_type', 5)]:
+            block[column] = encoders[column].codes([row[index] for row in chunk]).astype(np.int32)
+        yield block
+
+
+def stream_bounds(dataset: str, chunk_size: int = 10000) -> tuple[dict[str, tuple[float, float]],
+                                                                  dict[str, CategoricalEncoder]]:
+    """
+    Make a first pass over a CSV file, returning the (min, max) of each column in STREAM_NUMERIC_COLUMNS and the
+    encoders of the engine and car type columns, which have learned every category in the file. Only one chunk is
+    held in memory at a time.
+
+    Preconditions:
+    - dataset is the path to a CSV file that is properly formatted with car attributes.
+    - chunk_size > 0
+    """
+    encoders = {'engine': CategoricalEncoder(), 'car_type': CategoricalEncoder()}
+    bounds = {}
+    for block in iter_column_blocks(dataset, encoders, chunk_size):
+        for column in STREAM_NUMERIC_COLUMNS:
+            low, high = block[column].min().item(), block[column].max().item()
+            if column in bounds:
+                low, high = min(low, bounds[column][0]), max(high, bounds[column][1])
+            bounds[column] = (low, high)
+    return bounds, encoders
+
+
+def stream_normalized_data(dataset: str, chunk_size: int = 10000) -> Iterator[tuple[list[str], np.ndarray]]:
+    """
+    Stream the normalized attributes of every car in a CSV file, one chunk at a time, in two passes.
+
+    The first pass finds the running (min, max) of every numerical column and the engine and car type categories.
+    The second pass yields, for each chunk, the car names and a float32 matrix with one row per car: the numerical
+    columns in STREAM_NUMERIC_COLUMNS rescaled to between 0 and 1, followed by one-hot columns for each car type and
+    each engine type in order of first appearance. Peak memory depends on chunk_size, not on the size of the file.
+
+    Preconditions:
+    - dataset is the path to a CSV file that is properly formatted with car attributes.
+    - chunk_size > 0
+    """
+    bounds, encoders = stream_bounds(dataset, chunk_size)
+    num_types, num_engines = len(encoders['car_type'].categories), len(encoders['engine'].categories)
+
+    for block in iter_column_blocks(dataset, encoders, chunk_size):
+        features = np.zeros((len(block['names']), len(STREAM_NUMERIC_COLUMNS) + num_types + num_engines),
+                            dtype=np.float32)
+        for j, column in enumerate(STREAM_NUMERIC_COLUMNS):
+            low, high = bounds[column]
+            features[:, j] = (block[column] - low) / (high - low) if high > low else 0
+        rows = np.arange(len(block['names']))
+        features[rows, len(STREAM_NUMERIC_COLUMNS) + block['car_type']] = 1
+        features[rows, len(STREAM_NUMERIC_COLUMNS) + num_types + block['engine']] = 1
+        yield block['names'], features
+
+
 if __name__ == '__main__':
     import python_ta
 
     python_ta.check_all(config={
-        'extra-imports': ['csv'],  # the names (strs) of imported modules
-        'allowed-io': ['create_full_data'],  # the names (strs) of functions that call print/open/input
+        'extra-imports': ['csv', 'itertools', 'typing', 'numpy', 'catalog'],  # the names (strs) of imported modules
+        # the names (strs) of functions that call print/open/input
+        'allowed-io': ['create_full_data', 'iter_row_chunks'],
         'max-line-length': 120
     })
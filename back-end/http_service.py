@@ -0,0 +1,294 @@
+"""CSC111 Winter 2024 Project: Car Recommender System
+
+Module Description
+==================
+This module contains a headless HTTP/JSON front end to the car recommender system, so it can be used without the
+pygame interface of front-end/main.py. It exposes three endpoints:
+    - /search: the cars matching the five dropdown choices, the same as tree.car_guesser
+    - /rank: the matching cars ranked by the four slider values, the same as tree.car_ranker
+    - /similar: the cars most similar to a given car, the same as WeightedGraph.recommend_cars
+    - /metrics: the timings and counters recorded by metrics.py, when instrumentation is enabled
+
+Parameters are given either as a JSON object in the body of a POST request, or in the query string of a GET request,
+where a list is given by repeating its name (for example ?car=Car%201&k=3 or ?weights=50&weights=60&...). For
+example, POST /rank with the body
+    {"preferences": ["V8", "450-620", "$50,000-$99,999", "500-750", "Sports"], "weights": [50, 60, 70, 80], "k": 5}
+returns the five best matching cars.
+
+Requests are accepted on an asyncio event loop, while the scoring itself runs on a thread or process pool, so the
+event loop keeps accepting requests while others are being scored. Identical requests that arrive while the first
+one is still being scored are coalesced: they all wait for the same result instead of scoring it again. The catalog,
+decision tree and similarity scores are loaded once, from the car data file's snapshot, and stay in memory.
+
+Run this module with the path of a car data file to start the service, e.g.
+    python http_service.py car_data_set.csv --port 8080
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import metrics
+from queries import rank, search, similar, warm_up
+
+# The parameters of every endpoint that hold a list, an integer or a string. Any other parameter is ignored.
+LIST_PARAMETERS = {'preferences', 'weights'}
+INT_PARAMETERS = {'k'}
+STRING_PARAMETERS = {'car'}
+
+# The largest request body accepted, in bytes.
+MAX_BODY_SIZE = 1 << 16
+
+# The reason phrase of every status code sent by the service.
+STATUS_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                  413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+# The logger reporting the errors raised while answering a request.
+_LOGGER = logging.getLogger('http_service')
+
+
+# Maps the path of every endpoint to the function computing its result and the parameters it requires.
+ENDPOINTS: dict[str, tuple[Callable, list[str]]] = {
+    '/search': (search, ['preferences']),
+    '/rank': (rank, ['preferences', 'weights']),
+    '/similar': (similar, ['car'])
+}
+
+
+class RequestError(Exception):
+    """An error in a request, sent back to the client with the given status code.
+
+    Instance Attributes:
+        - status: The HTTP status code of the response.
+        - message: The reason the request failed.
+    """
+    status: int
+    message: str
+
+    def __init__(self, status: int, message: str) -> None:
+        """Initialize a new request error with the given status code and message."""
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class RecommendationServer:
+    """An HTTP server answering the endpoints in ENDPOINTS for one car data file.
+
+    Instance Attributes:
+        - car_file: The path of the car data file the results come from.
+        - executor: The thread or process pool computing the results.
+        - requests: The number of requests answered.
+        - coalesced: The number of requests answered with the result of an identical request already in flight.
+
+    Representation Invariants:
+        - self.coalesced <= self.requests
+    """
+    car_file: str
+    executor: Executor
+    requests: int
+    coalesced: int
+
+    # Private Instance Attributes:
+    #     - _in_flight: Maps the endpoint and parameters of every request being computed to its future result.
+    _in_flight: dict[tuple[str, str], asyncio.Future]
+
+    def __init__(self, car_file: str, executor: Executor) -> None:
+        """Initialize a new server for the given car data file, computing results with the given executor.
+
+        Preconditions:
+            - every worker of executor has already run warm_up(car_file), or will load the data on its first call
+        """
+        self.car_file = car_file
+        self.executor = executor
+        self.requests = 0
+        self.coalesced = 0
+        self._in_flight = {}
+
+    async def call(self, path: str, parameters: dict[str, Any]) -> Any:
+        """Return the result of the given endpoint for the given parameters.
+
+        If an identical request is already being computed, wait for its result instead of computing it again.
+        Raise a RequestError if the endpoint does not exist or the parameters are invalid.
+        """
+        if path == '/metrics':
+            return metrics.snapshot()
+        if path not in ENDPOINTS:
+            raise RequestError(404, 'unknown endpoint ' + path)
+        function, required = ENDPOINTS[path]
+        missing = [name for name in required if name not in parameters]
+        if missing:
+            raise RequestError(400, 'missing parameters: ' + ', '.join(missing))
+
+        self.requests += 1
+        key = (path, json.dumps(parameters, sort_keys=True))
+        if key in self._in_flight:
+            self.coalesced += 1
+            return await asyncio.shield(self._in_flight[key])
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, _call_endpoint, function, self.car_file, parameters)
+        self._in_flight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            del self._in_flight[key]
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer every request sent on one client connection, until the client closes it or asks to close it."""
+        try:
+            keep_alive = True
+            while keep_alive:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = await _read_headers(reader)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                status, result = await self._respond(request_line, headers, reader)
+                _write_response(writer, status, result, keep_alive)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request_line: bytes, headers: dict[str, str],
+                       reader: asyncio.StreamReader) -> tuple[int, Any]:
+        """Return the status code and the JSON result of one request, reading its body from reader."""
+        try:
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            return 400, {'error': 'malformed request'}
+        if length > MAX_BODY_SIZE:
+            return 413, {'error': 'request body too large'}
+        body = await reader.readexactly(length) if length > 0 else b''
+
+        try:
+            url = urlsplit(target)
+            if method == 'GET':
+                parameters = _query_parameters(url.query)
+            elif method == 'POST':
+                parameters = _body_parameters(body)
+            else:
+                raise RequestError(405, 'only GET and POST are supported')
+            return 200, await self.call(url.path, parameters)
+        except RequestError as error:
+            return error.status, {'error': error.message}
+        except (KeyError, ValueError, TypeError, IndexError) as error:
+            return 400, {'error': 'invalid parameters: ' + repr(error)}
+        except Exception as error:
+            # Any other error is a bug in the service rather than in the request, so report it and keep serving.
+            _LOGGER.exception('error while answering %s %s', method, target)
+            return 500, {'error': 'internal error: ' + repr(error)}
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8080) -> None:
+        """Accept requests on the given host and port until the task running this method is cancelled."""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def _call_endpoint(function: Callable, car_file: str, parameters: dict[str, Any]) -> Any:
+    """Return function(car_file, **parameters), keeping only the parameters the endpoints accept."""
+    accepted = LIST_PARAMETERS | INT_PARAMETERS | STRING_PARAMETERS
+    return function(car_file, **{name: value for name, value in parameters.items() if name in accepted})
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    """Read the headers of a request from reader, up to the blank line ending them, with lowercase names."""
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            return headers
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+
+def _query_parameters(query: str) -> dict[str, Any]:
+    """Return the parameters given in the query string of a GET request."""
+    parameters = {}
+    for name, values in parse_qs(query).items():
+        if name in LIST_PARAMETERS:
+            parameters[name] = values
+        elif name in INT_PARAMETERS:
+            parameters[name] = int(values[0])
+        elif name in STRING_PARAMETERS:
+            parameters[name] = values[0]
+    return parameters
+
+
+def _body_parameters(body: bytes) -> dict[str, Any]:
+    """Return the parameters given as a JSON object in the body of a POST request."""
+    try:
+        parameters = json.loads(body or b'{}')
+    except ValueError:
+        raise RequestError(400, 'the request body is not valid JSON') from None
+    if not isinstance(parameters, dict):
+        raise RequestError(400, 'the request body must be a JSON object')
+    return parameters
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, result: Any, keep_alive: bool) -> None:
+    """Write an HTTP response with the given status code and JSON result to writer."""
+    body = json.dumps(result).encode('utf-8')
+    head = (f'HTTP/1.1 {status} {STATUS_REASONS[status]}\r\n'
+            f'Content-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+    writer.write(head.encode('latin-1') + body)
+
+
+def make_executor(car_file: str, workers: Optional[int] = None, processes: bool = False) -> Executor:
+    """Return a pool of the given number of workers for a RecommendationServer of car_file.
+
+    A process pool scores requests in parallel on every core, and each of its workers loads the data of car_file
+    when it starts; the similarity scores are memory-mapped, so the workers share one copy of them. A thread pool
+    shares the data already loaded in this process.
+    """
+    if processes:
+        return ProcessPoolExecutor(max_workers=workers, initializer=warm_up, initargs=(car_file,))
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Start the service with the given command line arguments, and serve requests until interrupted."""
+    parser = argparse.ArgumentParser(description='Serve car recommendations over HTTP.')
+    parser.add_argument('car_file', nargs='?', default='car_data_set.csv', help='the car data file to serve')
+    parser.add_argument('--host', default='127.0.0.1', help='the address to listen on')
+    parser.add_argument('--port', type=int, default=8080, help='the port to listen on')
+    parser.add_argument('--workers', type=int, default=None, help='the number of workers scoring requests')
+    parser.add_argument('--processes', action='store_true', help='score requests in processes instead of threads')
+    args = parser.parse_args(argv)
+
+    warm_up(args.car_file)
+    with make_executor(args.car_file, args.workers, args.processes) as executor:
+        server = RecommendationServer(args.car_file, executor)
+        try:
+            asyncio.run(server.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['argparse', 'asyncio', 'json', 'logging', 'concurrent.futures', 'typing', 'urllib.parse',
+                          'metrics', 'queries'],
+        'allowed-io': [],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
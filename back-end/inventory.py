@@ -0,0 +1,284 @@
+"""CSC111 Winter 2024 Project: Car Recommender System
+
+Module Description
+==================
+This module contains a live car inventory, which keeps the decision tree, the similarity graph and the normalized
+car attributes up to date as cars are added, removed and updated, instead of rebuilding all of them from the CSV file
+after every change.
+
+Adding a car inserts one path into the decision tree and computes one row of similarity scores; removing a car
+deletes one leaf of the tree and the edges of one vertex of the graph. The only change that touches every edge is a
+change in the (min, max) bounds used to normalize an attribute, which happens when a car sets a new minimum or
+maximum, or when the car holding one is removed. In that case every similarity score is recomputed in a single
+vectorized pass.
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from catalog import load_catalog
+from data_work import FEATURE_COLUMNS, CategoricalEncoder
+from project_graphs import WeightedGraph
+import ranking
+import tree as tree_module
+
+# The normalized attributes of a car, in the same order as in project_graphs.generate_car_dict.
+NORMALIZED_COLUMNS = FEATURE_COLUMNS[1:]
+
+# The position of each normalized attribute in the values of tree.car_dict.
+ATTRIBUTE_POSITIONS = {'rating': 0, 'reliability': 1, 'zero_to_sixty': 2, 'max_speed': 3, 'hp': 6, 'price': 7,
+                       'torque': 8}
+
+
+class Inventory:
+    """The decision tree, similarity graph and attributes of a changing collection of cars.
+
+    The similarity scores are the same as the ones of project_graphs.load_complete_graph: the normalized
+    attributes come first, followed by the one-hot encoded car type and engine type.
+
+    Instance Attributes:
+        - tree: The decision tree of the cars, the same as tree.build_decision_tree would build.
+        - graph: The complete graph of similarity scores between the cars.
+        - bounds: Maps each attribute in NORMALIZED_COLUMNS to its current (min, max) over the cars.
+        - refreshes: The number of times every similarity score was recomputed because the bounds changed.
+
+    Representation Invariants:
+        - len(self._names) == len(self._cars) == len(self._slots)
+        - all(self._names[self._slots[name]] == name for name in self._cars)
+    """
+    tree: tree_module.Tree
+    graph: WeightedGraph
+    bounds: dict[str, tuple[float, float]]
+    refreshes: int
+
+    # Private Instance Attributes:
+    #     - _cars: Maps each car name to its attributes, in the same order as the values of tree.car_dict.
+    #     - _names: The car name stored in each slot. Slots are the rows of the arrays below.
+    #     - _slots: Maps each car name to its slot.
+    #     - _raw: Row i holds the attributes in NORMALIZED_COLUMNS of the car in slot i, before normalization.
+    #             Only the first len(self._names) rows are used; the rest is spare capacity.
+    #     - _car_types: The encoder of the car types, which learns new car types as they are added.
+    #     - _engines: The encoder of the engine types, which learns new engine types as they are added.
+    #     - _type_codes: The car type code of the car in each slot.
+    #     - _engine_codes: The engine type code of the car in each slot.
+    _cars: dict[str, list]
+    _names: list[str]
+    _slots: dict[str, int]
+    _raw: np.ndarray
+    _car_types: CategoricalEncoder
+    _engines: CategoricalEncoder
+    _type_codes: np.ndarray
+    _engine_codes: np.ndarray
+
+    def __init__(self, cars: Optional[dict[str, list]] = None) -> None:
+        """Initialize a new inventory holding the given cars.
+
+        cars maps each car name to its attributes, in the same order as the values of tree.car_dict. If it is None,
+        the inventory starts empty.
+        """
+        cars = cars or {}
+        self.tree = tree_module.Tree('', [])
+        self.graph = WeightedGraph()
+        self.refreshes = 0
+        self._cars = {}
+        self._names = []
+        self._slots = {}
+        self._raw = np.zeros((max(len(cars), 16), len(NORMALIZED_COLUMNS)), dtype=np.float64)
+        self._car_types = CategoricalEncoder()
+        self._engines = CategoricalEncoder()
+        self._type_codes = np.zeros(len(self._raw), dtype=np.int64)
+        self._engine_codes = np.zeros(len(self._raw), dtype=np.int64)
+
+        for name, attributes in cars.items():
+            self._insert(name, attributes)
+        self.bounds = self._current_bounds()
+        self._connect_all()
+
+    def __len__(self) -> int:
+        """Return the number of cars in this inventory."""
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        """Return whether a car with the given name is in this inventory."""
+        return name in self._cars
+
+    def car_dict(self) -> dict[str, list]:
+        """Return the dictionary mapping each car name to its attributes, in the same format as tree.car_dict.
+
+        The returned dictionary is kept up to date by this inventory, so it must not be mutated.
+        """
+        return self._cars
+
+    def performance_bounds(self) -> dict[str, tuple[float, float]]:
+        """Return the current (min, max) of each attribute of the performance score, as used by tree.car_ranker."""
+        return {column: self.bounds[column] for column in ranking.PERFORMANCE_COLUMNS}
+
+    def find_cars(self, preferences: list) -> list[str]:
+        """Return the cars matching the given preferences, in the same format as for tree.car_guesser."""
+        return self.tree.find_cars(tree_module.encode_preferences(preferences))
+
+    def add_car(self, name: str, attributes: list) -> None:
+        """Add a car with the given name and attributes to this inventory.
+
+        Raise a ValueError if a car with the given name is already in this inventory.
+
+        Preconditions:
+            - attributes is in the same order as the values of tree.car_dict
+        """
+        if name in self._cars:
+            raise ValueError
+        tree_module.decision_path(name, attributes)  # Fail before changing anything if an attribute is invalid.
+
+        old_bounds = self.bounds
+        self._insert(name, attributes)
+        self._update_graph(name, old_bounds)
+
+    def remove_car(self, name: str) -> None:
+        """Remove the car with the given name from this inventory.
+
+        Raise a KeyError if no car has the given name.
+        """
+        old_bounds = self.bounds
+        self._delete(name)
+        self._update_graph(None, old_bounds)
+
+    def update_car(self, name: str, attributes: list) -> None:
+        """Replace the attributes of the car with the given name.
+
+        Raise a KeyError if no car has the given name.
+
+        Preconditions:
+            - attributes is in the same order as the values of tree.car_dict
+        """
+        if name not in self._cars:
+            raise KeyError(name)
+        tree_module.decision_path(name, attributes)
+
+        old_bounds = self.bounds
+        self._delete(name)
+        self._insert(name, attributes)
+        self._update_graph(name, old_bounds)
+
+    def _insert(self, name: str, attributes: list) -> None:
+        """Store the given car in the decision tree and in a new slot, without adding it to the graph."""
+        self.tree.insert_sequence(tree_module.decision_path(name, attributes))
+
+        slot = len(self._names)
+        if slot == len(self._raw):
+            self._grow()
+        self._raw[slot] = [attributes[ATTRIBUTE_POSITIONS[column]] for column in NORMALIZED_COLUMNS]
+        self._type_codes[slot] = self._car_types.codes([attributes[9]])[0]
+        self._engine_codes[slot] = self._engines.codes([attributes[5]])[0]
+
+        self._cars[name] = attributes
+        self._names.append(name)
+        self._slots[name] = slot
+
+    def _delete(self, name: str) -> None:
+        """Remove the given car from the decision tree, the graph and its slot.
+
+        The car in the last slot is moved into the freed slot, so the used slots stay contiguous.
+        """
+        attributes = self._cars.pop(name)
+        self.tree.remove_sequence(tree_module.decision_path(name, attributes))
+        self.graph.remove_vertex(name)
+
+        slot, last = self._slots.pop(name), len(self._names) - 1
+        if slot != last:
+            moved = self._names[last]
+            self._names[slot] = moved
+            self._slots[moved] = slot
+            for array in (self._raw, self._type_codes, self._engine_codes):
+                array[slot] = array[last]
+        self._names.pop()
+
+    def _grow(self) -> None:
+        """Double the capacity of the slot arrays."""
+        self._raw = np.concatenate([self._raw, np.zeros_like(self._raw)])
+        self._type_codes = np.concatenate([self._type_codes, np.zeros_like(self._type_codes)])
+        self._engine_codes = np.concatenate([self._engine_codes, np.zeros_like(self._engine_codes)])
+
+    def _current_bounds(self) -> dict[str, tuple[float, float]]:
+        """Return the (min, max) of each attribute in NORMALIZED_COLUMNS over the cars, or (0, 0) with no cars."""
+        raw = self._raw[:len(self._names)]
+        if len(raw) == 0:
+            return {column: (0.0, 0.0) for column in NORMALIZED_COLUMNS}
+        minimums, maximums = raw.min(axis=0).tolist(), raw.max(axis=0).tolist()
+        return {column: (minimums[j], maximums[j]) for j, column in enumerate(NORMALIZED_COLUMNS)}
+
+    def _features(self) -> np.ndarray:
+        """Return the attributes of the car in every used slot, in the same format as generate_car_dict."""
+        n = len(self._names)
+        raw = self._raw[:n]
+        minimums = np.array([self.bounds[column][0] for column in NORMALIZED_COLUMNS])
+        spans = np.array([self.bounds[column][1] - self.bounds[column][0] for column in NORMALIZED_COLUMNS])
+        normalized = np.divide(raw - minimums, spans, out=np.zeros_like(raw), where=spans != 0)
+
+        car_types = np.zeros((n, len(self._car_types.categories)))
+        car_types[np.arange(n), self._type_codes[:n]] = 1
+        engines = np.zeros((n, len(self._engines.categories)))
+        engines[np.arange(n), self._engine_codes[:n]] = 1
+        return np.hstack([normalized, car_types, engines])
+
+    def _update_graph(self, name: Optional[str], old_bounds: dict[str, tuple[float, float]]) -> None:
+        """Bring the graph up to date after the car with the given name was stored, or after a car was removed if
+        name is None.
+
+        If the bounds changed from old_bounds, every similarity score is recomputed. Otherwise only the scores of
+        the stored car are computed.
+        """
+        self.bounds = self._current_bounds()
+        if self.bounds != old_bounds:
+            self.refreshes += 1
+            self._connect_all()
+        elif name is not None:
+            self._connect(self._slots[name], self._features(), 0)
+
+    def _connect_all(self) -> None:
+        """Recompute the similarity score of every pair of cars, in slot order."""
+        for name in self._names:
+            self.graph.add_vertex(name)
+        features = self._features()
+        for slot in range(len(self._names)):
+            self._connect(slot, features, slot + 1)
+
+    def _connect(self, slot: int, features: np.ndarray, first: int) -> None:
+        """Set the similarity scores between the car in the given slot and the cars in slots first and above.
+
+        features must be the matrix returned by self._features().
+        """
+        name = self._names[slot]
+        distances = np.sqrt(((features[first:] - features[slot]) ** 2).sum(axis=1))
+        scores = (1 / (1 + distances)).tolist()
+
+        self.graph.add_vertex(name)
+        for other, score in zip(self._names[first:], scores):
+            if other != name:
+                self.graph.add_edge(name, other, score)
+
+
+def load_inventory(car_file: str) -> Inventory:
+    """Return a new inventory holding every car of the given car data file.
+
+    Preconditions:
+        - car_file is the path to a csv file in the format of the car_data_set.csv
+    """
+    catalog = load_catalog(car_file)
+    return Inventory({catalog.names[i]: catalog.attributes(i) for i in range(len(catalog))})
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['typing', 'numpy', 'catalog', 'data_work', 'project_graphs', 'ranking', 'tree'],
+        'allowed-io': [],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
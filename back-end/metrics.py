@@ -0,0 +1,230 @@
+"""CSC111 Winter 2024 Project: Car Recommender System
+
+Module Description
+==================
+This module contains the instrumentation of the car recommender system. The main stages of the pipeline (parsing
+the CSV file, building and querying the decision tree, ranking, building the similarity graph and recommending
+similar cars) and the frames of the user interface record how long they take as timing spans, and count what they
+process (rows parsed, candidate cars, graph edges, cache hits and misses) with counters.
+
+Instrumentation is disabled by default, and then every span and counter returns immediately, without reading the
+clock or taking a lock. It is enabled by calling enable(), or by setting the CAR_METRICS environment variable to 1
+before this module is imported. The recorded metrics can be read with snapshot(), written as a periodic JSON log
+line by start_periodic_log(), or served as JSON by a local HTTP endpoint started with start_metrics_server() (the
+HTTP service of http_service.py also answers /metrics).
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+
+
+class SpanStats:
+    """The timings recorded for one kind of span.
+
+    Instance Attributes:
+        - count: The number of spans recorded.
+        - total: The total duration of the spans, in seconds.
+        - maximum: The longest duration of a span, in seconds.
+
+    Representation Invariants:
+        - self.count >= 0
+        - self.maximum <= self.total
+    """
+    __slots__ = ('count', 'total', 'maximum')
+    count: int
+    total: float
+    maximum: float
+
+    def __init__(self) -> None:
+        """Initialize new statistics with no spans recorded."""
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return these statistics as a dictionary that can be saved as JSON."""
+        return {'count': self.count, 'total_seconds': self.total, 'max_seconds': self.maximum,
+                'mean_seconds': self.total / self.count if self.count else 0.0}
+
+
+class _Span:
+    """A context manager recording the time spent inside it as a span with the given name."""
+    __slots__ = ('name', 'start')
+    name: str
+    start: float
+
+    def __init__(self, name: str) -> None:
+        """Initialize a new span with the given name."""
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> _Span:
+        """Start timing this span."""
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Stop timing this span and record it."""
+        record(self.name, time.perf_counter() - self.start)
+
+
+# Whether metrics are recorded.
+_enabled = os.environ.get('CAR_METRICS') == '1'
+
+# The context manager returned by span while metrics are disabled. It does nothing and is shared by every caller.
+_NO_SPAN = contextlib.nullcontext()
+
+# Maps the name of every kind of span to its statistics, and the name of every counter to its value.
+_spans: dict[str, SpanStats] = {}
+_counters: dict[str, int] = {}
+
+# Held while _spans or _counters is changed or read.
+_lock = threading.Lock()
+
+
+def enable() -> None:
+    """Start recording metrics."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording metrics. The metrics recorded so far are kept."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Return whether metrics are being recorded."""
+    return _enabled
+
+
+def span(name: str) -> Any:
+    """Return a context manager recording the time spent inside it as a span with the given name.
+
+    For example:
+        with metrics.span('tree_build'):
+            tree = build_decision_tree(file)
+    """
+    if not _enabled:
+        return _NO_SPAN
+    return _Span(name)
+
+
+def record(name: str, seconds: float) -> None:
+    """Record a span with the given name that took the given number of seconds."""
+    if not _enabled:
+        return
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            stats = _spans[name] = SpanStats()
+        stats.count += 1
+        stats.total += seconds
+        stats.maximum = max(stats.maximum, seconds)
+
+
+def record_since(name: str, start: float) -> None:
+    """Record a span with the given name that started at the given time.perf_counter() value and ends now."""
+    if _enabled:
+        record(name, time.perf_counter() - start)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add amount to the counter with the given name."""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def snapshot() -> dict[str, Any]:
+    """Return every metric recorded so far, as a dictionary that can be saved as JSON."""
+    with _lock:
+        return {'enabled': _enabled,
+                'spans': {name: stats.to_dict() for name, stats in sorted(_spans.items())},
+                'counters': dict(sorted(_counters.items()))}
+
+
+def reset() -> None:
+    """Forget every metric recorded so far."""
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def log_line() -> str:
+    """Return the metrics recorded so far as a single line of JSON, prefixed with the current time."""
+    return json.dumps({'time': time.time(), **snapshot()})
+
+
+def start_periodic_log(interval: float = 60.0, write: Optional[Callable[[str], Any]] = None) -> threading.Event:
+    """Write log_line() every interval seconds from a background thread, until the returned event is set.
+
+    The lines are written to standard error, or passed to write if it is given.
+
+    Preconditions:
+        - interval > 0
+    """
+    stop = threading.Event()
+
+    def _log() -> None:
+        while not stop.wait(interval):
+            line = log_line()
+            if write is None:
+                print(line, file=sys.stderr, flush=True)
+            else:
+                write(line)
+
+    threading.Thread(target=_log, name='metrics-log', daemon=True).start()
+    return stop
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """The request handler of the server started by start_metrics_server."""
+
+    def do_GET(self) -> None:
+        """Answer GET /metrics with the recorded metrics as JSON, and any other path with 404."""
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = json.dumps(snapshot()).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        """Do not log every request."""
+
+
+def start_metrics_server(host: str = '127.0.0.1', port: int = 9100) -> ThreadingHTTPServer:
+    """Serve the recorded metrics as JSON at http://host:port/metrics from a background thread, and return the
+    server. Call its shutdown method to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['contextlib', 'json', 'os', 'sys', 'threading', 'time', 'http.server', 'typing'],
+        'allowed-io': ['start_periodic_log'],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
@@ -0,0 +1,192 @@
+"""CSC111 Winter 2024 Project: Car Recommender System
+
+Module Description
+==================
+This module contains an on-disk storage backend for the similarity scores between every pair of cars. The complete
+graph of project_graphs stores each score twice, as Python floats inside the neighbours of both vertices, and the
+dense matrix of similarity.py still holds all n * n scores in memory. Since the scores are symmetric and the
+diagonal is never used, this module only stores the scores above the diagonal, packed row by row into a single
+float32 file:
+
+    scores[0, 1], scores[0, 2], ..., scores[0, n - 1], scores[1, 2], ..., scores[n - 2, n - 1]
+
+The file is opened as a memory map, so recommending cars only reads the pages holding one row of the matrix, and
+every process opening the same file shares the operating system's page cache instead of holding its own copy.
+The file is saved inside the compiled snapshot of the car data file (see snapshot.py), next to the normalized
+attributes it is computed from.
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+
+import numpy as np
+
+import metrics
+import similarity
+from snapshot import DEFAULT_SNAPSHOT_DIRECTORY, load_snapshot
+
+# The name of the packed matrix file inside a snapshot directory.
+PACKED_FILE = 'similarity_packed.npy'
+
+
+def row_offsets(n: int) -> np.ndarray:
+    """Return the position in the packed file of the first score of every row of an n by n matrix.
+
+    Row i holds the n - i - 1 scores scores[i, i + 1], ..., scores[i, n - 1].
+
+    >>> row_offsets(4).tolist()
+    [0, 3, 5, 6]
+    """
+    rows = np.arange(n, dtype=np.int64)
+    return rows * n - rows * (rows + 1) // 2
+
+
+def save_packed_matrix(path: str, features: np.ndarray, block_size: int = 256) -> None:
+    """Compute the similarity scores between every pair of rows of features and save the packed scores above the
+    diagonal to the given .npy file.
+
+    The scores are computed one strip of block_size rows at a time, so only one strip is ever held in memory. The
+    file is written under a temporary name first and then renamed, so it is either complete or missing.
+
+    Preconditions:
+        - block_size > 0
+    """
+    n = features.shape[0]
+    features = np.asarray(features, dtype=np.float64)
+    squared_norms = np.einsum('ij,ij->i', features, features)
+    offsets = row_offsets(n)
+
+    handle, staging = tempfile.mkstemp(suffix='.npy', dir=os.path.dirname(path) or '.')
+    os.close(handle)
+    packed = np.lib.format.open_memmap(staging, mode='w+', dtype=np.float32, shape=(n * (n - 1) // 2,))
+
+    with metrics.span('graph_build'):
+        for row_start in range(0, n, block_size):
+            rows = slice(row_start, min(row_start + block_size, n))
+            strip = similarity_strip(features, squared_norms, rows, block_size)
+            for i in range(rows.start, rows.stop):
+                packed[offsets[i]:offsets[i] + n - i - 1] = strip[i - row_start, i - row_start + 1:]
+    metrics.count('edges', len(packed))
+
+    packed.flush()
+    del packed
+    os.replace(staging, path)
+
+
+def similarity_strip(features: np.ndarray, squared_norms: np.ndarray, rows: slice, block_size: int) -> np.ndarray:
+    """Return the float32 similarity scores between the cars in the given rows and the cars from rows.start on,
+    computed one tile of block_size columns at a time.
+    """
+    n = features.shape[0]
+    strip = np.empty((rows.stop - rows.start, n - rows.start), dtype=np.float32)
+    for col_start in range(rows.start, n, block_size):
+        cols = slice(col_start, min(col_start + block_size, n))
+        strip[:, col_start - rows.start:cols.stop - rows.start] = \
+            similarity.similarity_tile(features, squared_norms, rows, cols)
+    return strip
+
+
+class PackedSimilarityMatrix:
+    """A complete graph of car similarity scores, stored in a memory-mapped packed file.
+
+    Instance Attributes:
+        - names: The car names. The i-th row of the matrix belongs to names[i].
+
+    Representation Invariants:
+        - len(self._packed) == len(self.names) * (len(self.names) - 1) // 2
+    """
+    names: list[str]
+
+    # Private Instance Attributes:
+    #     - _packed: The memory-mapped scores above the diagonal, packed row by row.
+    #     - _offsets: The position in _packed of the first score of every row.
+    #     - _index: Maps each car name to its row.
+    _packed: np.ndarray
+    _offsets: np.ndarray
+    _index: dict[str, int]
+
+    def __init__(self, names: list[str], path: str) -> None:
+        """Open the packed matrix of the given car names saved at path by save_packed_matrix.
+
+        Only the file header is read; the scores are read from disk as rows are needed.
+        """
+        self.names = names
+        self._packed = np.load(path, mmap_mode='r')
+        self._offsets = row_offsets(len(names))
+        self._index = {name: i for i, name in enumerate(names)}
+
+    def row(self, i: int) -> np.ndarray:
+        """Return the float32 similarity scores between the car in row i and every car, with 0 for the car itself.
+
+        The scores after the diagonal are one contiguous slice of the file. The scores before it are in column i of
+        the rows above, one score per row, and are gathered with a single indexed read.
+        """
+        n = len(self.names)
+        scores = np.zeros(n, dtype=np.float32)
+        above = np.arange(i, dtype=np.int64)
+        scores[:i] = self._packed[self._offsets[:i] + (i - above - 1)]
+        scores[i + 1:] = self._packed[self._offsets[i]:self._offsets[i] + n - i - 1]
+        return scores
+
+    def score(self, car1: str, car2: str) -> float:
+        """Return the similarity score between the two given cars.
+
+        Preconditions:
+            - car1 in self.names and car2 in self.names
+            - car1 != car2
+        """
+        i, j = sorted([self._index[car1], self._index[car2]])
+        return float(self._packed[self._offsets[i] + j - i - 1])
+
+    def recommend_cars(self, car: str, k: int = 5) -> list:
+        """
+        Recommend a list of the k cars most similar to the specified car, in the same format as
+        WeightedGraph.recommend_cars. Only the row of car is read from the file.
+
+        Preconditions:
+        - car in self.names
+        - k >= 0
+        """
+        i = self._index[car]
+        row = self.row(i).astype(np.float64)
+        row[i] = -np.inf
+        return [(self.names[j], round(row[j] * 100)) for j in similarity.top_k(row, min(k, len(row) - 1))]
+
+    def recommend_many(self, cars: list[str], k: int = 5) -> dict[str, list]:
+        """
+        Return a dictionary mapping each of the given cars to the list returned by self.recommend_cars(car, k).
+
+        Preconditions:
+        - all(car in self.names for car in cars)
+        - k >= 0
+        """
+        return {car: self.recommend_cars(car, k) for car in cars}
+
+
+def load_packed_matrix(dataset: str, directory: str = DEFAULT_SNAPSHOT_DIRECTORY,
+                       block_size: int = 256) -> PackedSimilarityMatrix:
+    """
+    Return the packed similarity matrix holding the same scores as similarity.load_similarity_matrix(dataset),
+    computing and saving it into the snapshot of dataset the first time.
+    """
+    snapshot = load_snapshot(dataset, directory)
+    path = os.path.join(snapshot.directory, PACKED_FILE)
+    if not os.path.isfile(path):
+        save_packed_matrix(path, snapshot.features, block_size)
+    return PackedSimilarityMatrix(snapshot.feature_names, path)
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['os', 'tempfile', 'numpy', 'metrics', 'similarity', 'snapshot'],
+        'allowed-io': [],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
@@ -18,8 +18,10 @@ from __future__ import annotations
 
 from typing import Any, Union
 
+import heapq
 import math
 import data_work
+import metrics
 
 
 def generate_car_dict(csv_data: str) -> dict:
@@ -56,6 +58,7 @@ class WeightedGraph:
     #     - _vertices:
     #         A collection of the vertices contained in this graph.
     #         Maps item to _WeightedVertex object.
+    __slots__ = ('_vertices',)
     _vertices: dict[Any, _WeightedVertex]
 
     def __init__(self) -> None:
@@ -94,6 +97,18 @@ class WeightedGraph:
             # We didn't find an existing vertex for both items.
             raise ValueError
 
+    def remove_vertex(self, item: Any) -> None:
+        """Remove the vertex with the given item from this graph, along with all of its edges.
+
+        Raise a ValueError if item does not appear as a vertex in this graph.
+        """
+        if item not in self._vertices:
+            raise ValueError
+
+        v = self._vertices.pop(item)
+        for u in v.neighbours:
+            del u.neighbours[v]
+
     def get_euc_sim_score(self, item1: Any, item2: Any, car_d: dict) -> float:
         """
         Calculates the Euclidean similarity score between two vertices, representing cars.
@@ -108,22 +123,61 @@ class WeightedGraph:
         i2 = self._vertices[item2]
         return i1.euc_similiarity_score(i2, car_d)
 
-    def recommend_cars(self, car: str) -> list:
+    def recommend_cars(self, car: str, k: int = 5) -> list:
         """
-        Recommend a list of cars similar to the specified car based on the Euclidean similarity score.
+        Recommend a list of the k cars most similar to the specified car based on the Euclidean similarity score.
+
+        Only the k best neighbours are kept while scanning the neighbours of car, instead of sorting all of them.
+        Neighbours with equal scores are returned in the order they were added to the graph.
 
         Preconditions:
         - The car must be a vertex in the graph.
         - The graph must have weighted edges representing Euclidean similarity scores.
+        - k >= 0
+        """
+        with metrics.span('graph_recommendation'):
+            car_v = self._vertices[car]
+            best = heapq.nlargest(k, car_v.neighbours.items(), key=lambda item: item[1])
+            return [(elem.item, round(weight * 100)) for elem, weight in best]
+
+    def recommend_many(self, cars: list[str], k: int = 5) -> dict[str, list]:
+        """
+        Return a dictionary mapping each of the given cars to the list returned by self.recommend_cars(car, k).
+
+        Preconditions:
+        - All cars must be vertices in the graph.
+        - k >= 0
+        """
+        return {car: self.recommend_cars(car, k) for car in cars}
+
+    def cars_within(self, car: str, hops: int) -> list:
+        """
+        Return the cars that can be reached from the specified car by following at most the given number of edges,
+        closest first. Cars the same number of edges away are listed in the order they were reached.
+
+        This is most useful on a sparse graph such as the one returned by similarity.load_knn_graph, where the
+        cars within 2 hops are the cars similar to the cars most similar to car.
+
+        Preconditions:
+        - The car must be a vertex in the graph.
+        - hops >= 0
         """
-        lst = []
+        start = self._vertices[car]
+        visited = {start}
+        frontier = [start]
+        reached = []
+
+        for _ in range(hops):
+            next_frontier = []
+            for v in frontier:
+                for u in v.neighbours:
+                    if u not in visited:
+                        visited.add(u)
+                        next_frontier.append(u)
+            reached.extend(u.item for u in next_frontier)
+            frontier = next_frontier
 
-        car_v = self._vertices[car]
-        nei_d = car_v.neighbours
-        sorted_dict = dict(sorted(nei_d.items(), key=lambda item: (item[1]), reverse=True))
-        for elem in sorted_dict:
-            lst.append((elem.item, round(car_v.neighbours[elem] * 100)))
-        return lst[:5]
+        return reached
 
 
 class _WeightedVertex:
@@ -143,6 +197,7 @@ class _WeightedVertex:
         - self not in self.neighbours
         - all(self in u.neighbours for u in self.neighbours)
     """
+    __slots__ = ('item', 'neighbours')
     item: Any
     neighbours: dict[_WeightedVertex, Union[int, float]]
 
@@ -185,12 +240,14 @@ def load_complete_graph(dataset: str) -> WeightedGraph:
     car_d = generate_car_dict(dataset)
 
     g = WeightedGraph()
-    for car in car_d:
-        g.add_vertex(car)
-    for car1 in car_d:
-        for car2 in car_d:
-            if car1 != car2:
-                g.add_edge(car1, car2, g.get_euc_sim_score(car1, car2, car_d))
+    with metrics.span('graph_build'):
+        for car in car_d:
+            g.add_vertex(car)
+        for car1 in car_d:
+            for car2 in car_d:
+                if car1 != car2:
+                    g.add_edge(car1, car2, g.get_euc_sim_score(car1, car2, car_d))
+    metrics.count('edges', len(car_d) * (len(car_d) - 1) // 2)
 
     return g
 
@@ -199,7 +256,7 @@ if __name__ == '__main__':
     import python_ta
 
     python_ta.check_all(config={
-        'extra-imports': ['data_work', 'math'],  # the names (strs) of imported modules
+        'extra-imports': ['data_work', 'heapq', 'math', 'metrics'],  # the names (strs) of imported modules
         'allowed-io': [],  # the names (strs) of functions that call print/open/input
         'max-line-length': 120
     })
@@ -0,0 +1,71 @@
+"""CSC111 Winter 2024 Project: Car Recommender System
+
+Module Description
+==================
+This module contains the queries shared by the headless front ends of the car recommender system: the HTTP service
+of http_service.py and the batch command line tool of batch_cli.py. Each query takes the path of a car data file and
+returns plain lists and dictionaries that can be saved as JSON:
+    - search: the cars matching the five dropdown choices, the same as tree.car_guesser
+    - rank: the matching cars ranked by the four slider values, the same as tree.car_ranker
+    - similar: the cars most similar to a given car, the same as WeightedGraph.recommend_cars
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from catalog import load_catalog
+import ranking
+from recommendation_service import get_recommendation_service
+from snapshot import load_snapshot
+import tree
+
+
+def search(car_file: str, preferences: list) -> list[str]:
+    """Return the names of the cars of car_file matching the five dropdown choices, as tree.car_guesser."""
+    return tree.car_guesser(car_file, preferences)
+
+
+def rank(car_file: str, preferences: list, weights: list, k: Optional[int] = None) -> list[dict]:
+    """Return the cars of car_file matching the five dropdown choices, ranked by the four slider values, keeping
+    only the first k cars if k is not None.
+
+    The cars are in the same order and have the same scores as the ones returned by tree.car_ranker.
+    """
+    cars = tree.car_guesser(car_file, preferences)
+    if not cars:
+        return []
+
+    catalog = load_catalog(car_file)
+    rows = np.array(list(dict.fromkeys(catalog.index_of(car) for car in cars)))
+    return [{'name': name, 'score': score, 'image': image, 'performance': performance}
+            for name, (score, image, performance) in ranking.rank_indices(catalog, rows, weights, k)]
+
+
+def similar(car_file: str, car: str, k: int = 5) -> list[dict]:
+    """Return the k cars of car_file most similar to the given car, with their similarity scores out of 100."""
+    recommendations = get_recommendation_service(car_file).recommend_cars(car, k)
+    return [{'name': name, 'score': score} for name, score in recommendations]
+
+
+def warm_up(car_file: str) -> None:
+    """Load the snapshot, decision tree and similarity scores of car_file in this process."""
+    load_snapshot(car_file)
+    tree.load_decision_tree(car_file)
+    get_recommendation_service(car_file).backend()
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['typing', 'numpy', 'catalog', 'ranking', 'recommendation_service', 'snapshot', 'tree'],
+        'allowed-io': [],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
@@ -0,0 +1,162 @@
+"""CSC111 Winter 2024 Project: Car Recommendation and Ranking System
+
+Module Description
+==================
+This module contains the ranking engine behind tree.car_ranker. Instead of scoring the chosen cars one at a time,
+it takes their attributes as columns (either from the car_dict dictionary or as rows of a catalog) and computes the
+weighted score and the performance score of every car in a single vectorized pass. When only the best k cars are
+needed, they are found with a partial selection so the rest of the cars are never sorted.
+
+The scores are the same as the ones described in tree.car_ranker.
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+import numpy as np
+
+from catalog import Catalog
+import metrics
+
+# The attributes normalized by their (min, max) bounds in the performance score.
+PERFORMANCE_COLUMNS = ['hp', 'torque', 'zero_to_sixty', 'max_speed']
+
+
+def performance_bounds(catalog: Catalog) -> dict[str, tuple[float, float]]:
+    """Return the (min, max) of each attribute of the performance score over the whole catalog.
+
+    The bounds come from the statistics the catalog computes once, so they are not recomputed for every query.
+    """
+    stats = catalog.stats()
+    return {column: stats[column].bounds() for column in PERFORMANCE_COLUMNS}
+
+
+def weighted_scores(preferences: list[str], rating: np.ndarray, reliability: np.ndarray,
+                    zero_to_sixty: np.ndarray, max_speed: np.ndarray) -> np.ndarray:
+    """Return the weighted score of every car, given the user's four slider values as preferences.
+
+    Preconditions:
+        - len(preferences) == 4
+    """
+    rating_weight = int(preferences[0]) / 100
+    reliability_weight = int(preferences[1]) / 100
+    zero_to_sixity_weight = int(preferences[2]) / 100
+    max_speed_weight = int(preferences[3]) / 100
+
+    return (rating * rating_weight + reliability * reliability_weight - zero_to_sixty * zero_to_sixity_weight
+            + max_speed * max_speed_weight) / 4
+
+
+def performance_scores(hp: np.ndarray, torque: np.ndarray, zero_to_sixty: np.ndarray, max_speed: np.ndarray,
+                       bounds: dict[str, tuple[float, float]]) -> np.ndarray:
+    """Return the rounded performance score of every car, out of 100.
+
+    bounds maps each attribute in PERFORMANCE_COLUMNS to its (min, max) over the catalog.
+    """
+    normalized_speed = _normalize(max_speed, bounds['max_speed'])
+    normalized_hp = _normalize(hp, bounds['hp'])
+    normalized_torque = _normalize(torque, bounds['torque'])
+    normalized_zero_to_sixty = 1 - _normalize(zero_to_sixty, bounds['zero_to_sixty'])
+
+    combined_score = (normalized_hp + normalized_torque + normalized_zero_to_sixty + normalized_speed) / 4
+    performance_score = combined_score * 100
+
+    performance_score = np.where(performance_score < 50, performance_score + 20, performance_score)
+    performance_score = np.where((51 <= performance_score) & (performance_score < 75),
+                                 performance_score + 20, performance_score)
+    return np.round(performance_score).astype(np.int64)
+
+
+def _normalize(values: np.ndarray, bounds: tuple[float, float]) -> np.ndarray:
+    """Rescale values to between 0 and 1, given the (min, max) bounds of the attribute.
+
+    Every value is rescaled to 0 when the bounds are equal.
+    """
+    if bounds[1] == bounds[0]:
+        return np.zeros(len(values))
+    return (values - bounds[0]) / (bounds[1] - bounds[0])
+
+
+def rank_columns(names: list[str], preferences: list[str], columns: dict[str, np.ndarray],
+                 image_paths: list[str], bounds: dict[str, tuple[float, float]], k: Optional[int] = None) -> list:
+    """Return the cars with the given names ranked in the same format as tree.car_ranker, keeping only the first k
+    cars if k is not None.
+
+    columns maps 'rating', 'reliability', 'zero_to_sixty', 'max_speed', 'hp' and 'torque' to the values of that
+    attribute for each car in names, and image_paths holds the image path of each car without its extension.
+    bounds maps each attribute in PERFORMANCE_COLUMNS to its (min, max) over the catalog.
+
+    Cars are ordered by weighted score, then image, then performance score, all from highest to lowest; cars tied
+    on all three keep their order in names.
+
+    Preconditions:
+        - names != []
+        - all(len(column) == len(names) for column in columns.values())
+        - k is None or k >= 0
+    """
+    metrics.count('ranked_cars', len(names))
+    with metrics.span('ranking'):
+        total = weighted_scores(preferences, columns['rating'], columns['reliability'], columns['zero_to_sixty'],
+                                columns['max_speed'])
+        performance = performance_scores(columns['hp'], columns['torque'], columns['zero_to_sixty'],
+                                         columns['max_speed'], bounds)
+
+        if k == 0:
+            return []
+
+        candidates = np.arange(len(names))
+        if k is not None and k < len(names):
+            # Every car tied with the k-th best weighted score is kept, so the image and performance score decide it.
+            kth = np.partition(total, len(total) - k)[len(total) - k]
+            candidates = np.flatnonzero(total >= kth)
+
+        # Ties are broken on the image file name, extension included, which is what tree.car_ranker compared.
+        images = np.array([os.path.join(image_paths[i] + '.jpg') for i in candidates.tolist()], dtype=str)
+        image_ranks = np.unique(images, return_inverse=True)[1]
+        order = candidates[np.lexsort((candidates, -performance[candidates], -image_ranks, -total[candidates]))]
+        if k is not None:
+            order = order[:k]
+
+        total_list, performance_list = total.tolist(), performance.tolist()
+        return [(names[i], (total_list[i], os.path.join(image_paths[i] + '.jpg'), performance_list[i]))
+                for i in order.tolist()]
+
+
+def rank_indices(catalog: Catalog, indices: np.ndarray, preferences: list[str], k: Optional[int] = None) -> list:
+    """Return the cars in the given catalog rows ranked in the same format as tree.car_ranker, keeping only the
+    first k cars if k is not None.
+
+    The performance scores are normalized with the bounds of the whole catalog, from its statistics.
+
+    Preconditions:
+        - len(indices) > 0
+        - k is None or k >= 0
+    """
+    indices = np.asarray(indices)
+    columns = {
+        'rating': catalog.rating[indices],
+        'reliability': catalog.reliability[indices],
+        'zero_to_sixty': catalog.zero_to_sixty[indices],
+        'max_speed': catalog.max_speed[indices],
+        'hp': catalog.hp[indices],
+        'torque': catalog.torque[indices]
+    }
+    rows = indices.tolist()
+    return rank_columns([catalog.names[i] for i in rows], preferences, columns,
+                        [catalog.image_path[i] for i in rows], performance_bounds(catalog), k)
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['os', 'typing', 'numpy', 'catalog', 'metrics'],  # the names (strs) of imported modules
+        'allowed-io': [],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
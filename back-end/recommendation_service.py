@@ -0,0 +1,145 @@
+"""CSC111 Winter 2024 Project: Car Recommender System
+
+Module Description
+==================
+This module contains the recommendation service used by the user interface to find cars similar to a chosen car.
+The service keeps its similarity backend loaded between calls and only rebuilds it when the car data file changes.
+It also remembers the most recent recommendations in a least recently used (LRU) cache, keyed by the version of
+the car data and the queried car, so asking for the same car again does not search the backend again.
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+from catalog import load_catalog
+import metrics
+import packed_similarity
+import similarity
+
+
+class RecommendationService:
+    """A long-lived service recommending cars similar to a given car, backed by an LRU cache.
+
+    Instance Attributes:
+        - dataset: The path of the car data file the recommendations come from.
+        - cache_size: The largest number of recommendation lists kept in the cache.
+        - hits: The number of recommendations answered from the cache.
+        - misses: The number of recommendations that had to be computed.
+
+    Representation Invariants:
+        - self.cache_size > 0
+        - len(self._cache) <= self.cache_size
+    """
+    dataset: str
+    cache_size: int
+    hits: int
+    misses: int
+
+    # Private Instance Attributes:
+    #     - _load_backend: The function building a backend with a recommend_cars(car, k) method from dataset.
+    #     - _backend: The loaded backend, or None if it has not been loaded yet.
+    #     - _version: The catalog version _backend was built from.
+    #     - _cache: Maps (catalog version, car, k) to its recommendations, from least to most recently used.
+    #     - _lock: Held while the backend or the cache is read or changed, so the service can be shared by threads.
+    _load_backend: Callable[[str], Any]
+    _backend: Any
+    _version: str
+    _cache: OrderedDict[tuple[str, str, int], list]
+    _lock: threading.RLock
+
+    def __init__(self, dataset: str, cache_size: int = 256,
+                 load_backend: Callable[[str], Any] = similarity.load_similarity_matrix) -> None:
+        """Initialize a new service for the given car data file. The backend is loaded on the first query.
+
+        Preconditions:
+            - cache_size > 0
+        """
+        self.dataset = dataset
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._load_backend = load_backend
+        self._backend = None
+        self._version = ''
+        self._cache = OrderedDict()
+        self._lock = threading.RLock()
+
+    def backend(self) -> Any:
+        """Return the similarity backend for the current contents of the car data file, rebuilding it only if the
+        file has changed since it was last built.
+        """
+        version = load_catalog(self.dataset).version
+        with self._lock:
+            if self._backend is None or version != self._version:
+                self._backend = self._load_backend(self.dataset)
+                self._version = version
+            return self._backend
+
+    def recommend_cars(self, car: str, k: int = 5) -> list:
+        """Return the same list as the backend's recommend_cars(car, k), from the cache if possible.
+
+        Preconditions:
+            - car is the name of a car in the car data file
+            - k >= 0
+        """
+        with self._lock:
+            backend = self.backend()
+            key = (self._version, car, k)
+
+            if key in self._cache:
+                self.hits += 1
+                metrics.count('recommendation_cache_hits')
+                self._cache.move_to_end(key)
+                return list(self._cache[key])
+            self.misses += 1
+            metrics.count('recommendation_cache_misses')
+
+        with metrics.span('recommendation'):
+            recommendations = backend.recommend_cars(car, k)
+        with self._lock:
+            self._cache[key] = recommendations
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return list(recommendations)
+
+    def clear(self) -> None:
+        """Forget the loaded backend and every cached recommendation."""
+        with self._lock:
+            self._backend = None
+            self._version = ''
+            self._cache.clear()
+
+
+# Maps the absolute path of each car data file to its shared service.
+_services: dict[str, RecommendationService] = {}
+
+
+def get_recommendation_service(dataset: str) -> RecommendationService:
+    """Return the recommendation service shared by every caller for the given car data file.
+
+    The service is backed by the packed similarity matrix saved in the file's snapshot, so processes serving the
+    same file share its pages instead of each building the matrix in memory.
+    """
+    path = os.path.abspath(dataset)
+    if path not in _services:
+        _services[path] = RecommendationService(path, load_backend=packed_similarity.load_packed_matrix)
+    return _services[path]
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['os', 'threading', 'collections', 'typing', 'catalog', 'metrics', 'packed_similarity',
+                          'similarity'],
+        'allowed-io': [],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
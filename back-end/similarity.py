@@ -0,0 +1,377 @@
+"""CSC111 Winter 2024 Project: Car Recommender System
+
+Module Description
+==================
+This module contains a matrix-backed alternative to the complete graph built by project_graphs.load_complete_graph.
+Instead of storing every edge as a Python float inside a dictionary of every vertex, the similarity score between
+every pair of cars is stored in a single float32 matrix. The scores use the same formula as
+_WeightedVertex.euc_similiarity_score, 1 / (1 + distance), where distance is the Euclidean distance between the
+normalized attributes of the two cars returned by project_graphs.generate_car_dict.
+
+The matrix is computed tile by tile with vectorized NumPy operations, so building it for thousands of cars takes
+seconds rather than minutes. For larger catalogs, the tiles can also be spread over a pool of worker processes,
+which read the attributes from and write their tiles straight into shared memory.
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Callable, Optional
+
+import numpy as np
+
+import metrics
+import project_graphs
+
+# The shared arrays of a worker process of build_similarity_matrix_parallel, set by _attach_worker. Maps 'features',
+# 'squared_norms' and 'scores' to the arrays, and 'memory' to the list of shared memory blocks holding them.
+_worker_arrays: dict = {}
+
+
+def feature_matrix(car_d: dict) -> tuple[list[str], np.ndarray]:
+    """Return the car names of car_d and a matrix whose i-th row holds the attributes of the i-th car name.
+
+    Preconditions:
+        - car_d is a dictionary returned by project_graphs.generate_car_dict
+    """
+    names = list(car_d)
+    features = np.array([car_d[name] for name in names], dtype=np.float64)
+    return names, features.reshape(len(names), -1)
+
+
+def similarity_tile(features: np.ndarray, squared_norms: np.ndarray, rows: slice, cols: slice) -> np.ndarray:
+    """Return the similarity scores between the cars in the given rows and the cars in the given columns of features.
+
+    squared_norms[i] must be the squared length of features[i]. The distances are computed as
+    |a|^2 + |b|^2 - 2 a.b, so a whole tile is a single matrix product.
+    """
+    squared = squared_norms[rows, np.newaxis] + squared_norms[np.newaxis, cols] \
+        - 2 * (features[rows] @ features[cols].T)
+    np.maximum(squared, 0, out=squared)
+    return 1 / (1 + np.sqrt(squared))
+
+
+def build_similarity_matrix(features: np.ndarray, block_size: int = 1024) -> np.ndarray:
+    """Return the n by n float32 matrix of similarity scores between every pair of rows of features.
+
+    Only the tiles on and above the diagonal are computed; each one is also copied to its mirror below the diagonal.
+
+    Preconditions:
+        - block_size > 0
+    """
+    n = features.shape[0]
+    features = features.astype(np.float64)
+    squared_norms = np.einsum('ij,ij->i', features, features)
+    scores = np.empty((n, n), dtype=np.float32)
+
+    with metrics.span('graph_build'):
+        for row_start in range(0, n, block_size):
+            rows = slice(row_start, min(row_start + block_size, n))
+            for col_start in range(row_start, n, block_size):
+                cols = slice(col_start, min(col_start + block_size, n))
+                tile = similarity_tile(features, squared_norms, rows, cols)
+                scores[rows, cols] = tile
+                scores[cols, rows] = tile.T
+    metrics.count('edges', n * (n - 1) // 2)
+
+    return scores
+
+
+def build_similarity_matrix_parallel(features: np.ndarray, block_size: int = 1024, workers: Optional[int] = None,
+                                     progress: Optional[Callable[[int, int], None]] = None,
+                                     dtype: type = np.float32) -> np.ndarray:
+    """Return the same matrix as build_similarity_matrix(features, block_size), with its tiles computed by a pool
+    of worker processes.
+
+    workers is the number of processes, or None for one per CPU. The attributes and the matrix are kept in shared
+    memory, so each worker writes its tiles (and their mirrors) in place and nothing is copied between processes
+    but the tile coordinates. If progress is given, progress(done, total) is called in this process each time a
+    tile is finished, where total is the number of tiles. dtype is the type of the returned scores.
+
+    Preconditions:
+        - block_size > 0
+        - workers is None or workers > 0
+    """
+    n = features.shape[0]
+    features = np.ascontiguousarray(features, dtype=np.float64)
+    tiles = [(row_start, col_start) for row_start in range(0, n, block_size)
+             for col_start in range(row_start, n, block_size)]
+
+    shapes = {'features': (features.shape, np.float64), 'squared_norms': ((n,), np.float64),
+              'scores': ((n, n), dtype)}
+    memory = {name: shared_memory.SharedMemory(create=True, size=max(np.dtype(kind).itemsize * int(np.prod(shape)), 1))
+              for name, (shape, kind) in shapes.items()}
+    try:
+        arrays = {name: np.ndarray(shape, dtype=kind, buffer=memory[name].buf)
+                  for name, (shape, kind) in shapes.items()}
+        arrays['features'][:] = features
+        arrays['squared_norms'][:] = np.einsum('ij,ij->i', features, features)
+
+        layout = {name: (memory[name].name, shape, np.dtype(kind).str) for name, (shape, kind) in shapes.items()}
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_attach_worker,
+                                 initargs=(layout,)) as pool:
+            futures = [pool.submit(_compute_tile, row_start, col_start, block_size)
+                       for row_start, col_start in tiles]
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                if progress is not None:
+                    progress(done, len(tiles))
+
+        scores = arrays['scores'].copy()
+        del arrays
+    finally:
+        for block in memory.values():
+            block.close()
+            block.unlink()
+
+    return scores
+
+
+def _attach_worker(layout: dict[str, tuple[str, tuple, str]]) -> None:
+    """Attach this worker process to the shared arrays described by layout, which maps the name of each array to
+    the name of its shared memory block, its shape and its dtype.
+    """
+    _worker_arrays['memory'] = []
+    for name, (memory_name, shape, kind) in layout.items():
+        block = shared_memory.SharedMemory(name=memory_name)
+        _worker_arrays['memory'].append(block)
+        _worker_arrays[name] = np.ndarray(shape, dtype=np.dtype(kind), buffer=block.buf)
+
+
+def _compute_tile(row_start: int, col_start: int, block_size: int) -> None:
+    """Compute the tile of similarity scores starting at the given row and column in this worker's shared matrix,
+    and copy it to its mirror below the diagonal.
+    """
+    features = _worker_arrays['features']
+    n = features.shape[0]
+    rows = slice(row_start, min(row_start + block_size, n))
+    cols = slice(col_start, min(col_start + block_size, n))
+    tile = similarity_tile(features, _worker_arrays['squared_norms'], rows, cols)
+    _worker_arrays['scores'][rows, cols] = tile
+    _worker_arrays['scores'][cols, rows] = tile.T
+
+
+def nearest_neighbours(features: np.ndarray, k: int, block_size: int = 1024) -> tuple[np.ndarray, np.ndarray]:
+    """Return the indices and the similarity scores of the k most similar other rows of every row of features.
+
+    Row i of both returned arrays lists the neighbours of row i from most to least similar, with ties ordered by
+    index. The best k neighbours of each row are kept in a bounded buffer that is merged with one tile of scores at
+    a time, so memory use is O(n * k) plus one tile, never O(n * n).
+
+    Preconditions:
+        - 0 <= k < len(features)
+        - block_size > 0
+    """
+    n = features.shape[0]
+    features = features.astype(np.float64)
+    squared_norms = np.einsum('ij,ij->i', features, features)
+    indices = np.empty((n, k), dtype=np.int64)
+    scores = np.empty((n, k), dtype=np.float64)
+
+    for row_start in range(0, n, block_size):
+        rows = slice(row_start, min(row_start + block_size, n))
+        best_indices = np.empty((rows.stop - rows.start, 0), dtype=np.int64)
+        best_scores = np.empty((rows.stop - rows.start, 0), dtype=np.float64)
+
+        for col_start in range(0, n, block_size):
+            cols = slice(col_start, min(col_start + block_size, n))
+            tile = similarity_tile(features, squared_norms, rows, cols)
+            tile_indices = np.broadcast_to(np.arange(cols.start, cols.stop), tile.shape)
+            # A car is not its own neighbour.
+            tile = np.where(tile_indices == np.arange(rows.start, rows.stop)[:, np.newaxis], -np.inf, tile)
+
+            best_indices, best_scores = _best_k(np.hstack([best_indices, tile_indices]),
+                                                np.hstack([best_scores, tile]), k)
+
+        indices[rows] = best_indices
+        scores[rows] = best_scores
+
+    return indices, scores
+
+
+def _best_k(candidate_indices: np.ndarray, candidate_scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the indices and scores of the k best candidates of every row, from most to least similar, with ties
+    ordered by index.
+
+    Each row is first cut down to k candidates with np.argpartition, so only those k are sorted. A row with a tie at
+    the k-th best score that the partition may have split arbitrarily is sorted in full instead.
+    """
+    if 0 < k < candidate_scores.shape[1]:
+        kept = np.argpartition(-candidate_scores, k - 1, axis=1)[:, :k]
+        kept_scores = np.take_along_axis(candidate_scores, kept, axis=1)
+        kth = kept_scores.min(axis=1, keepdims=True)
+        split = np.flatnonzero((candidate_scores == kth).sum(axis=1) > (kept_scores == kth).sum(axis=1))
+        for i in split.tolist():
+            kept[i] = np.lexsort((candidate_indices[i], -candidate_scores[i]))[:k]
+        candidate_indices = np.take_along_axis(candidate_indices, kept, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, kept, axis=1)
+
+    order = np.lexsort((candidate_indices, -candidate_scores))[:, :k]
+    return np.take_along_axis(candidate_indices, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+
+def knn_graph(names: list[str], features: np.ndarray, k: int = 5,
+              block_size: int = 1024) -> project_graphs.WeightedGraph:
+    """Return a sparse similarity graph of the given cars, keeping only an edge between each car and its k most
+    similar cars.
+
+    The graph is undirected, so a car is also adjacent to every car it is one of the k most similar cars of, and
+    may have more than k neighbours. Its k most similar cars are always among them, so for any k2 <= k,
+    recommend_cars(car, k2) returns the same list as on the complete graph of load_complete_graph. Every vertex
+    lists its neighbours in the same order as in the complete graph.
+
+    Preconditions:
+        - len(names) == len(features)
+        - 0 <= k < len(names)
+    """
+    indices, scores = nearest_neighbours(features, k, block_size)
+
+    edges = {}
+    for i, (row_indices, row_scores) in enumerate(zip(indices.tolist(), scores.tolist())):
+        for j, score in zip(row_indices, row_scores):
+            edges[(min(i, j), max(i, j))] = score
+
+    g = project_graphs.WeightedGraph()
+    for car in names:
+        g.add_vertex(car)
+    for i, j in sorted(edges):
+        g.add_edge(names[i], names[j], edges[(i, j)])
+    return g
+
+
+def load_knn_graph(dataset: str, k: int = 5, block_size: int = 1024) -> project_graphs.WeightedGraph:
+    """
+    Creates a sparse similarity graph from car data stored in a CSV file, where each car is connected to its k
+    most similar cars. See knn_graph for the details.
+    """
+    names, features = feature_matrix(project_graphs.generate_car_dict(dataset))
+    return knn_graph(names, features, min(k, len(names) - 1), block_size)
+
+
+class SimilarityMatrix:
+    """A complete graph of car similarity scores, stored as a dense matrix.
+
+    Instance Attributes:
+        - names: The car names. The i-th row and column of scores belong to names[i].
+        - scores: The float32 matrix of similarity scores between every pair of cars.
+
+    Representation Invariants:
+        - self.scores.shape == (len(self.names), len(self.names))
+    """
+    names: list[str]
+    scores: np.ndarray
+
+    # Private Instance Attributes:
+    #     - _index: Maps each car name to its row in scores.
+    _index: dict[str, int]
+
+    def __init__(self, names: list[str], scores: np.ndarray) -> None:
+        """Initialize a new similarity matrix from the given car names and their scores."""
+        self.names = names
+        self.scores = scores
+        self._index = {name: i for i, name in enumerate(names)}
+
+    def recommend_cars(self, car: str, k: int = 5) -> list:
+        """
+        Recommend a list of the k cars most similar to the specified car, in the same format as
+        WeightedGraph.recommend_cars.
+
+        Preconditions:
+        - car in self.names
+        - k >= 0
+        """
+        i = self._index[car]
+        row = self.scores[i].astype(np.float64)
+        row[i] = -np.inf
+        return [(self.names[j], round(row[j] * 100)) for j in top_k(row, min(k, len(row) - 1))]
+
+    def recommend_many(self, cars: list[str], k: int = 5) -> dict[str, list]:
+        """
+        Return a dictionary mapping each of the given cars to the list returned by self.recommend_cars(car, k).
+
+        The rows of the given cars are read from the matrix together, and each row is then searched with a
+        partial selection.
+
+        Preconditions:
+        - all(car in self.names for car in cars)
+        - k >= 0
+        """
+        rows = [self._index[car] for car in cars]
+        block = self.scores[rows].astype(np.float64)
+        block[np.arange(len(rows)), rows] = -np.inf
+        k = min(k, self.scores.shape[0] - 1)
+
+        recommendations = {}
+        for car, row in zip(cars, block):
+            recommendations[car] = [(self.names[j], round(row[j] * 100)) for j in top_k(row, k)]
+        return recommendations
+
+
+def top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Return the indices of the k largest values, from largest to smallest.
+
+    The k-th largest value is found with a partial selection, so only the k chosen indices are sorted. Equal values
+    are ordered by index, so the result is the same as the first k indices of a stable descending sort.
+
+    Preconditions:
+        - 0 <= k <= len(values)
+    """
+    if k == 0:
+        return np.array([], dtype=np.intp)
+    kth = np.partition(values, len(values) - k)[len(values) - k]
+    above = np.flatnonzero(values > kth)
+    ties = np.flatnonzero(values == kth)[:k - len(above)]
+    chosen = np.concatenate([above, ties])
+    return chosen[np.argsort(-values[chosen], kind='stable')]
+
+
+def load_similarity_matrix(dataset: str, block_size: int = 1024, workers: int = 1,
+                           progress: Optional[Callable[[int, int], None]] = None) -> SimilarityMatrix:
+    """
+    Creates a similarity matrix holding the same scores as the graph returned by
+    project_graphs.load_complete_graph(dataset).
+
+    With more than one worker, the matrix is built by build_similarity_matrix_parallel with the given number of
+    worker processes and progress callback.
+    """
+    names, features = feature_matrix(project_graphs.generate_car_dict(dataset))
+    if workers > 1:
+        return SimilarityMatrix(names, build_similarity_matrix_parallel(features, block_size, workers, progress))
+    return SimilarityMatrix(names, build_similarity_matrix(features, block_size))
+
+
+def load_graph_parallel(dataset: str, block_size: int = 1024, workers: Optional[int] = None,
+                        progress: Optional[Callable[[int, int], None]] = None) -> project_graphs.WeightedGraph:
+    """
+    Creates the same complete graph as project_graphs.load_complete_graph(dataset), with the similarity scores
+    computed by build_similarity_matrix_parallel and then merged into the graph.
+
+    The scores are computed in double precision, like the ones of load_complete_graph.
+    """
+    names, features = feature_matrix(project_graphs.generate_car_dict(dataset))
+    scores = build_similarity_matrix_parallel(features, block_size, workers, progress, np.float64)
+
+    g = project_graphs.WeightedGraph()
+    for car in names:
+        g.add_vertex(car)
+    for i, row in enumerate(scores.tolist()):
+        for car, score in zip(names[i + 1:], row[i + 1:]):
+            g.add_edge(names[i], car, score)
+    return g
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['os', 'concurrent.futures', 'multiprocessing', 'typing', 'numpy', 'metrics',
+                          'project_graphs'],  # the names (strs) of imported modules
+        'allowed-io': [],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
@@ -0,0 +1,246 @@
+"""CSC111 Winter 2024 Project: Car Recommender System
+
+Module Description
+==================
+This module contains the compile step of the car recommender system. Compiling a car data file saves everything
+built from it (the catalog, the decision tree and the normalized attributes used for similarity scores) into a
+snapshot directory named after a hash of the file's contents. Loading a snapshot then skips parsing and encoding
+the CSV file: numeric columns and the normalized attributes are memory-mapped straight from disk, and the decision
+tree is rebuilt from its saved list of nodes.
+
+Each snapshot directory contains:
+    - manifest.json, recording the snapshot format, the catalog version, the number of rows and the statistics of
+      every numeric column
+    - one .npy file per numeric catalog column, plus the normalized attributes and the decision tree nodes
+    - one .txt file per text column, holding its values separated by NUL characters
+    - once it is first needed, the packed similarity matrix saved by packed_similarity.py
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Optional
+
+import numpy as np
+
+import catalog as catalog_module
+from catalog import CATALOG_COLUMNS, Catalog, ColumnStats
+import project_graphs
+import similarity
+import tree as tree_module
+
+# The version of the snapshot layout. Snapshots written with a different format are compiled again.
+SNAPSHOT_FORMAT = 3
+
+# The directory snapshots are stored in when no other directory is given.
+DEFAULT_SNAPSHOT_DIRECTORY = '.car_snapshots'
+
+# The catalog columns stored as text rather than as arrays.
+TEXT_COLUMNS = ['names', 'engine', 'car_type', 'image_path']
+
+
+class Snapshot:
+    """The structures built from one version of a car data file, loaded from a compiled snapshot.
+
+    Instance Attributes:
+        - directory: The snapshot directory these structures were loaded from.
+        - catalog: The catalog of the car data file.
+        - feature_names: The car names of generate_car_dict, in order.
+        - features: The normalized attributes of generate_car_dict, one row per name in feature_names.
+
+    Representation Invariants:
+        - len(self.features) == len(self.feature_names)
+    """
+    directory: str
+    catalog: Catalog
+    feature_names: list[str]
+    features: np.ndarray
+
+    # Private Instance Attributes:
+    #     - _tree_values: The encoded value of each node of the decision tree in preorder. The value of a leaf
+    #                     is the catalog row of its car, and the value of the root is unused.
+    #     - _tree_sizes: The number of subtrees of each node of the decision tree in preorder.
+    #     - _tree: The decision tree rebuilt from the two arrays above, or None if it has not been rebuilt yet.
+    _tree_values: np.ndarray
+    _tree_sizes: np.ndarray
+    _tree: Optional[tree_module.Tree]
+
+    def __init__(self, directory: str) -> None:
+        """Load the snapshot stored in the given directory.
+
+        Preconditions:
+            - directory was written by compile_snapshot
+        """
+        with open(os.path.join(directory, 'manifest.json')) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        columns = {}
+        for column in CATALOG_COLUMNS:
+            if column in TEXT_COLUMNS:
+                columns[column] = _load_text(os.path.join(directory, column + '.txt'), manifest['rows'])
+            else:
+                columns[column] = np.load(os.path.join(directory, column + '.npy'), mmap_mode='r')
+
+        self.directory = directory
+        stats = {column: ColumnStats.from_dict(data) for column, data in manifest['stats'].items()}
+        self.catalog = Catalog.from_columns(columns, manifest['catalog_version'], stats)
+        self.feature_names = [self.catalog.names[i] for i in np.load(os.path.join(directory, 'feature_rows.npy'))]
+        self.features = np.load(os.path.join(directory, 'features.npy'), mmap_mode='r')
+        self._tree_values = np.load(os.path.join(directory, 'tree_values.npy'), mmap_mode='r')
+        self._tree_sizes = np.load(os.path.join(directory, 'tree_sizes.npy'), mmap_mode='r')
+        self._tree = None
+
+    def tree(self) -> tree_module.Tree:
+        """Return the decision tree of the car data file, rebuilding it from the snapshot the first time."""
+        if self._tree is None:
+            self._tree = tree_module.tree_from_preorder(self._tree_nodes())
+        return self._tree
+
+    def flat_tree(self) -> tree_module.FlatTree:
+        """Return the decision tree of the car data file in its flat form, without building any Tree objects."""
+        return tree_module.FlatTree.from_preorder(self._tree_nodes())
+
+    def _tree_nodes(self) -> list[tuple[Any, int]]:
+        """Return the nodes of the decision tree, as listed by Tree.preorder."""
+        names = self.catalog.names
+        nodes = [('', int(self._tree_sizes[0]))]
+        # Level 0 is the root and level 6 holds the car names, so the leaves are the nodes without subtrees.
+        for value, size in zip(self._tree_values[1:].tolist(), self._tree_sizes[1:].tolist()):
+            nodes.append((names[value] if size == 0 else value, size))
+        return nodes
+
+
+def file_version(file: str) -> str:
+    """Return the hash of the given file's contents, the same as the version of its catalog."""
+    digest = hashlib.sha1()
+    with open(file, 'rb') as binary_file:
+        for block in iter(lambda: binary_file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compile_snapshot(car_file: str, directory: str = DEFAULT_SNAPSHOT_DIRECTORY) -> str:
+    """Compile the given car data file into a snapshot and return the snapshot's directory.
+
+    The snapshot is written to a temporary directory first and then renamed, so a snapshot directory is either
+    complete or missing. Several processes may compile the same car data file at once: the first rename wins, and
+    the others discard their own copy and return the snapshot already in place. A complete snapshot of the current
+    format is never deleted, since other processes may be reading it; a snapshot of an older format is renamed out
+    of the way before it is deleted.
+
+    Preconditions:
+        - car_file is the path to a csv file in the format of the car_data_set.csv
+    """
+    catalog = catalog_module.parse_catalog(car_file)
+    target = os.path.join(directory, catalog.version)
+    os.makedirs(directory, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=directory)
+
+    for column in CATALOG_COLUMNS:
+        if column in TEXT_COLUMNS:
+            _save_text(os.path.join(staging, column + '.txt'), getattr(catalog, column))
+        else:
+            np.save(os.path.join(staging, column + '.npy'), getattr(catalog, column))
+
+    catalog_module.register_catalog(car_file, catalog)
+    names, features = similarity.feature_matrix(project_graphs.generate_car_dict(car_file))
+    np.save(os.path.join(staging, 'feature_rows.npy'), np.array([catalog.index_of(name) for name in names]))
+    np.save(os.path.join(staging, 'features.npy'), features)
+
+    nodes = tree_module.build_decision_tree(car_file).preorder()
+    values = [-1] + [catalog.index_of(value) if size == 0 else value for value, size in nodes[1:]]
+    np.save(os.path.join(staging, 'tree_values.npy'), np.array(values, dtype=np.int64))
+    np.save(os.path.join(staging, 'tree_sizes.npy'), np.array([size for _, size in nodes], dtype=np.int64))
+
+    with open(os.path.join(staging, 'manifest.json'), 'w') as manifest_file:
+        json.dump({'format': SNAPSHOT_FORMAT, 'catalog_version': catalog.version, 'rows': len(catalog),
+                   'stats': {column: stats.to_dict() for column, stats in catalog.stats().items()}},
+                  manifest_file)
+
+    if _snapshot_format(target) == SNAPSHOT_FORMAT:
+        shutil.rmtree(staging, ignore_errors=True)
+        return target
+
+    stale = staging + '.stale'
+    try:
+        os.replace(target, stale)
+    except FileNotFoundError:
+        pass
+    if _snapshot_format(stale) == SNAPSHOT_FORMAT:
+        # Another process renamed its copy into place after ours was checked, so put its copy back instead.
+        shutil.rmtree(staging, ignore_errors=True)
+        staging = stale
+
+    try:
+        os.replace(staging, target)
+    except OSError as error:
+        # Another process renamed its copy into place after the old snapshot was moved out of the way.
+        if error.errno not in (errno.ENOTEMPTY, errno.EEXIST, errno.EACCES) \
+                or _snapshot_format(target) != SNAPSHOT_FORMAT:
+            raise
+        shutil.rmtree(staging, ignore_errors=True)
+    finally:
+        shutil.rmtree(stale, ignore_errors=True)
+    return target
+
+
+def load_snapshot(car_file: str, directory: str = DEFAULT_SNAPSHOT_DIRECTORY) -> Snapshot:
+    """Return the snapshot of the current contents of car_file, compiling it first if it does not exist yet.
+
+    The loaded catalog and decision tree become the ones returned by catalog.load_catalog and
+    tree.load_decision_tree, so the rest of the system uses them without parsing car_file again.
+
+    Preconditions:
+        - car_file is the path to a csv file in the format of the car_data_set.csv
+    """
+    target = os.path.join(directory, file_version(car_file))
+    if _snapshot_format(target) != SNAPSHOT_FORMAT:
+        target = compile_snapshot(car_file, directory)
+
+    snapshot = Snapshot(target)
+    catalog_module.register_catalog(car_file, snapshot.catalog)
+    tree_module.register_decision_tree(car_file, snapshot.catalog.version, snapshot.flat_tree())
+    return snapshot
+
+
+def _snapshot_format(snapshot_directory: str) -> Optional[int]:
+    """Return the format of the snapshot stored in the given directory, or None if there is no snapshot there."""
+    manifest_path = os.path.join(snapshot_directory, 'manifest.json')
+    if not os.path.isfile(manifest_path):
+        return None
+    with open(manifest_path) as manifest_file:
+        return json.load(manifest_file).get('format')
+
+
+def _save_text(path: str, values: list[str]) -> None:
+    """Write the given strings to path, separated by NUL characters."""
+    with open(path, 'w', encoding='utf-8', newline='') as text_file:
+        text_file.write('\0'.join(values))
+
+
+def _load_text(path: str, count: int) -> list[str]:
+    """Return the count strings written to path by _save_text."""
+    if count == 0:
+        return []
+    with open(path, encoding='utf-8', newline='') as text_file:
+        return text_file.read().split('\0')
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['errno', 'hashlib', 'json', 'os', 'shutil', 'tempfile', 'typing', 'numpy', 'catalog',
+                          'project_graphs', 'similarity', 'tree'],
+        'allowed-io': ['Snapshot.__init__', 'compile_snapshot', '_snapshot_format', '_save_text', '_load_text'],
+        'max-line-length': 120
+    })
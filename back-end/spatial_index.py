@@ -0,0 +1,212 @@
+"""CSC111 Winter 2024 Project: Car Recommender System
+
+Module Description
+==================
+This module contains a recommendation backend that does not need the similarity score of every pair of cars.
+Instead of a complete graph, it builds a k-d tree over the normalized attribute vectors returned by
+project_graphs.generate_car_dict. Each node of the k-d tree covers a box of the attribute space, so a query for the
+most similar cars only has to look at the few boxes that are close to the queried car.
+
+The similarity score of two cars is the same as in the complete graph, 1 / (1 + distance), so the closest cars
+are the most similar ones and the recommendations have the same format as WeightedGraph.recommend_cars.
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+"""
+from __future__ import annotations
+
+import heapq
+import math
+
+import numpy as np
+
+import project_graphs
+import similarity
+
+
+class KDTree:
+    """A k-d tree over a fixed set of points, answering k nearest neighbour queries.
+
+    The tree is stored as parallel lists indexed by node number, with node 0 as the root. The points of every node
+    are a contiguous range of self._order, and each internal node splits its range in half along the dimension in
+    which its points are the most spread out.
+
+    Representation Invariants:
+        - len(self._lower) == len(self._upper) == len(self._start) == len(self._end) == len(self._children)
+        - all(children == () or len(children) == 2 for children in self._children)
+    """
+    # Private Instance Attributes:
+    #     - _points: The points stored in this tree, one per row.
+    #     - _order: A permutation of the rows of _points, grouped by node.
+    #     - _lower: The smallest coordinates of the points in each node.
+    #     - _upper: The largest coordinates of the points in each node.
+    #     - _start: The start of each node's range in _order.
+    #     - _end: The end (exclusive) of each node's range in _order.
+    #     - _children: The (left, right) children of each node, or () for a leaf.
+    _points: np.ndarray
+    _order: np.ndarray
+    _lower: list[np.ndarray]
+    _upper: list[np.ndarray]
+    _start: list[int]
+    _end: list[int]
+    _children: list[tuple]
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 128) -> None:
+        """Build a k-d tree over the rows of points. Nodes with at most leaf_size points are not split.
+
+        Preconditions:
+            - len(points) > 0
+            - leaf_size > 0
+        """
+        self._points = np.ascontiguousarray(points, dtype=np.float64)
+        self._order = np.arange(len(points))
+        self._lower, self._upper = [], []
+        self._start, self._end = [], []
+        self._children = []
+
+        stack = [(self._new_node(0, len(points)), 0, len(points))]
+        while stack:
+            node, start, end = stack.pop()
+            spread = self._upper[node] - self._lower[node]
+            if end - start <= leaf_size or not spread.any():
+                continue
+
+            dim = int(np.argmax(spread))
+            mid = (start + end) // 2
+            rows = self._order[start:end]
+            self._order[start:end] = rows[np.argpartition(self._points[rows, dim], mid - start)]
+
+            left = self._new_node(start, mid)
+            right = self._new_node(mid, end)
+            self._children[node] = (left, right)
+            stack.append((left, start, mid))
+            stack.append((right, mid, end))
+
+    def _new_node(self, start: int, end: int) -> int:
+        """Add a leaf node covering self._order[start:end] and return its number."""
+        points = self._points[self._order[start:end]]
+        self._lower.append(points.min(axis=0))
+        self._upper.append(points.max(axis=0))
+        self._start.append(start)
+        self._end.append(end)
+        self._children.append(())
+        return len(self._children) - 1
+
+    def _box_distance(self, node: int, point: np.ndarray) -> float:
+        """Return the squared distance from point to the closest point of the box covered by node."""
+        below = np.maximum(self._lower[node] - point, 0)
+        above = np.maximum(point - self._upper[node], 0)
+        return float(below @ below + above @ above)
+
+    def query(self, point: np.ndarray, k: int, exclude: int = -1) -> list[tuple[int, float]]:
+        """Return the (row, distance) pairs of the k points closest to point, from closest to farthest.
+
+        The row given by exclude is never returned. Points at the same distance are ordered by row.
+
+        Preconditions:
+            - k >= 0
+        """
+        if k == 0:
+            return []
+
+        # best is a max-heap of the closest points found so far, keyed on (squared distance, row).
+        best = []
+        frontier = [(0.0, 0)]
+
+        while frontier:
+            box_distance, node = heapq.heappop(frontier)
+            if len(best) == k and box_distance > -best[0][0]:
+                break
+
+            if self._children[node]:
+                for child in self._children[node]:
+                    heapq.heappush(frontier, (self._box_distance(child, point), child))
+                continue
+
+            rows = self._order[self._start[node]:self._end[node]]
+            diffs = self._points[rows] - point
+            distances = np.einsum('ij,ij->i', diffs, diffs)
+            if len(best) == k:
+                close = distances <= -best[0][0]
+                rows, distances = rows[close], distances[close]
+            for row, squared in zip(rows.tolist(), distances.tolist()):
+                if row == exclude:
+                    continue
+                if len(best) < k:
+                    heapq.heappush(best, (-squared, -row))
+                elif (squared, row) < (-best[0][0], -best[0][1]):
+                    heapq.heapreplace(best, (-squared, -row))
+
+        return [(-row, math.sqrt(-squared)) for squared, row in sorted(best, reverse=True)]
+
+
+class SpatialRecommender:
+    """A recommendation backend answering similar car queries with a k-d tree instead of a complete graph.
+
+    Instance Attributes:
+        - names: The car names. names[i] is the car stored in row i of the k-d tree.
+    """
+    names: list[str]
+
+    # Private Instance Attributes:
+    #     - _tree: The k-d tree over the normalized attributes of the cars.
+    #     - _features: The normalized attributes of the cars, one row per car.
+    #     - _index: Maps each car name to its row.
+    _tree: KDTree
+    _features: np.ndarray
+    _index: dict[str, int]
+
+    def __init__(self, names: list[str], features: np.ndarray, leaf_size: int = 128) -> None:
+        """Initialize a new recommender over the given car names and their normalized attributes.
+
+        Preconditions:
+            - len(names) == len(features) > 0
+        """
+        self.names = names
+        self._features = np.asarray(features, dtype=np.float64)
+        self._tree = KDTree(self._features, leaf_size)
+        self._index = {name: i for i, name in enumerate(names)}
+
+    def recommend_cars(self, car: str, k: int = 5) -> list:
+        """
+        Recommend a list of the k cars most similar to the specified car, in the same format as
+        WeightedGraph.recommend_cars.
+
+        Preconditions:
+        - car in self.names
+        - k >= 0
+        """
+        i = self._index[car]
+        neighbours = self._tree.query(self._features[i], k, exclude=i)
+        return [(self.names[j], round(100 / (1 + distance))) for j, distance in neighbours]
+
+    def recommend_many(self, cars: list[str], k: int = 5) -> dict[str, list]:
+        """
+        Return a dictionary mapping each of the given cars to the list returned by self.recommend_cars(car, k).
+
+        Preconditions:
+        - all(car in self.names for car in cars)
+        - k >= 0
+        """
+        return {car: self.recommend_cars(car, k) for car in cars}
+
+
+def load_spatial_index(dataset: str, leaf_size: int = 128) -> SpatialRecommender:
+    """
+    Creates a k-d tree recommender for the cars stored in the given CSV file, giving the same recommendations as
+    project_graphs.load_complete_graph(dataset).
+    """
+    names, features = similarity.feature_matrix(project_graphs.generate_car_dict(dataset))
+    return SpatialRecommender(names, features, leaf_size)
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'extra-imports': ['heapq', 'math', 'numpy', 'project_graphs', 'similarity'],
+        'allowed-io': [],  # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
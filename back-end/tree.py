@@ -23,10 +23,15 @@ This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad A
 """
 from __future__ import annotations
 
-import csv
 import os
 from typing import Any, Optional
 
+import numpy as np
+
+from catalog import load_catalog
+import metrics
+import ranking
+
 
 def encode_engine(engine: str) -> int:
     """
@@ -162,6 +167,7 @@ class Tree:
        Representation Invariants:
            - self._root is not None or self._subtrees == []
            - all(not subtree.is_empty() for subtree in self._subtrees)
+           - all(self._children[subtree._root] is subtree for subtree in self._subtrees)
 
        Instance Attributes:
           - _root:
@@ -171,12 +177,17 @@ class Tree:
               self._root is None (representing an empty tree). However, this attribute
               may be empty when self._root is not None, which represents a tree consisting
               of just one item.
+          - _children:
+              Maps the root value of each subtree to that subtree, so the subtree matching an attribute value
+              can be found without scanning _subtrees.
 
 
        """
 
+    __slots__ = ('_root', '_subtrees', '_children')
     _root: Optional[Any]
     _subtrees: list[Tree]
+    _children: dict[Any, Tree]
 
     def __init__(self, root: Optional[Any], subtrees: list[Tree]) -> None:
         """Initialize a new Tree with the given root value and subtrees.
@@ -188,6 +199,9 @@ class Tree:
         """
         self._root = root
         self._subtrees = subtrees
+        self._children = {}
+        for subtree in subtrees:
+            self._children.setdefault(subtree._root, subtree)
 
     def is_empty(self) -> bool:
         """Return whether this tree is empty.
@@ -220,12 +234,41 @@ class Tree:
         # Directly use the attribute without encoding
         attribute = attributes[index]
 
-        for sub in self._subtrees:
-            if sub._root == attribute:
-                return sub.find_cars(attributes, index + 1)
+        if attribute in self._children:
+            return self._children[attribute].find_cars(attributes, index + 1)
 
         return []
 
+    def add_subtree(self, subtree: Tree) -> None:
+        """Add the given subtree as the last subtree of this tree.
+
+        Preconditions:
+            - not self.is_empty()
+            - not subtree.is_empty()
+            - subtree._root not in self._children
+        """
+        self._subtrees.append(subtree)
+        self._children[subtree._root] = subtree
+
+    def preorder(self) -> list[tuple[Any, int]]:
+        """Return the (root value, number of subtrees) of every node of this tree, listed in preorder.
+
+        The tree can be rebuilt from this list with tree_from_preorder.
+
+        >>> t = Tree('', [Tree(1, [Tree('Car A', [])]), Tree(2, [])])
+        >>> t.preorder()
+        [('', 2), (1, 1), ('Car A', 0), (2, 0)]
+        >>> tree_from_preorder(t.preorder()).preorder() == t.preorder()
+        True
+        """
+        nodes = []
+        stack = [self]
+        while stack:
+            tree = stack.pop()
+            nodes.append((tree._root, len(tree._subtrees)))
+            stack.extend(reversed(tree._subtrees))
+        return nodes
+
     def insert_sequence(self, items: list) -> None:
         """
         Adds a sequence of attributes ending with a car model into the tree.
@@ -243,15 +286,12 @@ class Tree:
         if not items:
             return
 
-        insert = None
-        for sub in self._subtrees:
-            if sub._root == items[0]:
-                insert = sub
-                break
+        insert = self._children.get(items[0])
 
         if insert is None:
             insert = Tree(items[0], [])
             self._subtrees.append(insert)
+            self._children[items[0]] = insert
 
         insert.recursive_helper(items[1:])
 
@@ -269,71 +309,244 @@ class Tree:
         if not items:
             return
 
-        for sub in self._subtrees:
-            if sub._root == items[0]:
-                sub.recursive_helper(items[1:])
-                return
+        if items[0] in self._children:
+            self._children[items[0]].recursive_helper(items[1:])
+            return
 
         new_sub = Tree(items[0], [])
         self._subtrees.append(new_sub)
+        self._children[items[0]] = new_sub
 
         new_sub.recursive_helper(items[1:])
 
+    def remove_sequence(self, items: list) -> bool:
+        """
+        Removes the car model at the end of a sequence of attributes from the tree, and return whether it was found.
+
+        This method undoes insert_sequence: it follows the path given by items and deletes its last node. Any node
+        on the path that is left without subtrees is deleted as well, so the tree looks the same as if the car model
+        had never been inserted.
+        """
+        if not items or items[0] not in self._children:
+            return False
+
+        subtree = self._children[items[0]]
+        if len(items) > 1:
+            if not subtree.remove_sequence(items[1:]):
+                return False
+            if subtree._subtrees:
+                return True
+
+        self._subtrees.remove(subtree)
+        del self._children[items[0]]
+        return True
+
+
+def tree_from_preorder(nodes: list[tuple[Any, int]]) -> Tree:
+    """Return the tree whose nodes, listed by Tree.preorder, are the given nodes.
+
+    Preconditions:
+        - nodes == t.preorder() for some non-empty tree t
+    """
+    root = Tree(nodes[0][0], [])
+    # Each entry is a tree whose subtrees are still being added, and how many subtrees it is missing.
+    stack = [[root, nodes[0][1]]]
+
+    for value, num_subtrees in nodes[1:]:
+        while stack[-1][1] == 0:
+            stack.pop()
+        parent = stack[-1]
+        parent[1] -= 1
+
+        subtree = Tree(value, [])
+        parent[0].add_subtree(subtree)
+        stack.append([subtree, num_subtrees])
+
+    return root
+
+
+class FlatTree:
+    """
+    A read-only decision tree stored as a few flat arrays instead of one Python object per node.
+
+    The nodes are numbered in breadth-first order, so the subtrees of every node are consecutive. Car names are
+    interned: every leaf stores the integer ID of its car name instead of the name itself. A FlatTree answers
+    find_cars in the same way as the Tree it was built from.
+
+    Instance Attributes:
+        - values: The encoded attribute value of each node, or -1 for the root and the leaves.
+        - child_offsets: The subtrees of node i are the nodes child_offsets[i] to child_offsets[i + 1] - 1.
+        - leaf_ids: The car name ID of each leaf, or -1 for the nodes that are not leaves.
+        - names: The interned car names. The leaf with ID j stores the car name names[j].
+
+    Representation Invariants:
+        - len(self.values) == len(self.leaf_ids) == len(self.child_offsets) - 1
+        - all(0 <= j < len(self.names) for j in self.leaf_ids if j != -1)
+    """
+    __slots__ = ('values', 'child_offsets', 'leaf_ids', 'names')
+    values: np.ndarray
+    child_offsets: np.ndarray
+    leaf_ids: np.ndarray
+    names: list[str]
+
+    def __init__(self, values: np.ndarray, child_offsets: np.ndarray, leaf_ids: np.ndarray,
+                 names: list[str]) -> None:
+        """Initialize a new flat tree from its arrays."""
+        self.values = values
+        self.child_offsets = child_offsets
+        self.leaf_ids = leaf_ids
+        self.names = names
+
+    @classmethod
+    def from_preorder(cls, nodes: list[tuple[Any, int]]) -> FlatTree:
+        """Return the flat form of the tree whose nodes, listed by Tree.preorder, are the given nodes.
+
+        Nodes other than the root whose value is a string are leaves holding a car name.
+
+        Preconditions:
+            - nodes == t.preorder() for some non-empty tree t
+
+        >>> flat = FlatTree.from_preorder([('', 2), (1, 1), ('Car A', 0), (2, 0)])
+        >>> flat.values.tolist(), flat.child_offsets.tolist(), flat.leaf_ids.tolist()
+        ([-1, 1, 2, -1], [1, 3, 4, 4, 4], [-1, -1, -1, 0])
+        >>> flat.find_cars([1])
+        ['Car A']
+        """
+        subtrees = [[] for _ in nodes]
+        # Each entry is a node whose subtrees are still being found, and how many subtrees it is missing.
+        stack = [[0, nodes[0][1]]]
+        for i in range(1, len(nodes)):
+            while stack[-1][1] == 0:
+                stack.pop()
+            stack[-1][1] -= 1
+            subtrees[stack[-1][0]].append(i)
+            stack.append([i, nodes[i][1]])
+
+        order = [0]
+        offsets = []
+        for node in order:
+            offsets.append(len(order))
+            order.extend(subtrees[node])
+        offsets.append(len(order))
+
+        name_ids = {}
+        values = []
+        leaf_ids = []
+        for position, node in enumerate(order):
+            value = nodes[node][0]
+            if position > 0 and isinstance(value, str):
+                values.append(-1)
+                leaf_ids.append(name_ids.setdefault(value, len(name_ids)))
+            else:
+                values.append(value if position > 0 else -1)
+                leaf_ids.append(-1)
+
+        return cls(np.array(values, dtype=np.int32), np.array(offsets, dtype=np.int32),
+                   np.array(leaf_ids, dtype=np.int32), list(name_ids))
+
+    @classmethod
+    def from_tree(cls, tree: Tree) -> FlatTree:
+        """Return the flat form of the given non-empty tree."""
+        return cls.from_preorder(tree.preorder())
+
+    def find_cars(self, attributes: list, index: int = 0) -> list:
+        """Return the same list of car models as Tree.find_cars(attributes, index) on the tree this flat tree was
+        built from.
+        """
+        node = 0
+        for attribute in attributes[index:]:
+            if not isinstance(attribute, int):
+                return []
+            start, stop = self.child_offsets[node], self.child_offsets[node + 1]
+            matches = np.flatnonzero((self.values[start:stop] == attribute) & (self.leaf_ids[start:stop] == -1))
+            if len(matches) == 0:
+                return []
+            node = start + int(matches[0])
+
+        start, stop = self.child_offsets[node], self.child_offsets[node + 1]
+        return [self.names[j] for j in self.leaf_ids[start:stop].tolist() if j != -1]
+
 
 def build_decision_tree(file: str) -> Tree:
     """Build a decision tree storing the car data from the given file.
 
+    The file is read through the shared catalog, so it is only parsed again if it has changed.
+
     Preconditions:
         - file is the path to a csv file in the format of the car_data_set.csv
     """
     tree = Tree('', [])
+    catalog = load_catalog(file)
 
-    with open(file) as csv_file:
-        reader = csv.reader(csv_file)
-        next(reader)
+    with metrics.span('tree_build'):
+        for i in range(len(catalog)):
+            tree.insert_sequence(decision_path(catalog.names[i], catalog.attributes(i)))
 
-        for row in reader:
-            car_model = row.pop(0)
-            engine = encode_engine(row[0])
-            hp = encode_hp(int(row[1]))
-            price = encode_price(int(row[2]))
-            torque = encode_torque(int(row[3]))
-            car_type = encode_car_type(row[4])
+    return tree
 
-            attributes_sequence = [engine, hp, price, torque, car_type] + [car_model]
-            tree.insert_sequence(attributes_sequence)
 
-    return tree
+def decision_path(name: str, attributes: list) -> list:
+    """Return the path of the car with the given name in the decision tree: its encoded engine, horsepower, price,
+    torque and car type, followed by its name.
+
+    Preconditions:
+        - attributes is in the same order as the values of car_dict
+    """
+    engine = encode_engine(attributes[5])
+    hp = encode_hp(attributes[6])
+    price = encode_price(attributes[7])
+    torque = encode_torque(attributes[8])
+    car_type = encode_car_type(attributes[9])
+    return [engine, hp, price, torque, car_type, name]
+
+
+# Maps the absolute path of each car data file to (catalog version, flat decision tree built from that version).
+_decision_trees: dict[str, tuple[str, FlatTree]] = {}
+
+
+def register_decision_tree(file: str, version: str, tree: FlatTree) -> None:
+    """Make load_decision_tree(file) return the given tree while the file's catalog has the given version."""
+    _decision_trees[os.path.abspath(file)] = (version, tree)
+
+
+def load_decision_tree(file: str) -> FlatTree:
+    """Return the decision tree of the given file in its flat form, building it only once per version of the file.
+
+    The tree is kept for as long as the process runs, so it is stored as a FlatTree rather than as Tree objects.
+
+    Preconditions:
+        - file is the path to a csv file in the format of the car_data_set.csv
+    """
+    path = os.path.abspath(file)
+    version = load_catalog(path).version
+    if path not in _decision_trees or _decision_trees[path][0] != version:
+        _decision_trees[path] = (version, FlatTree.from_tree(build_decision_tree(path)))
+    return _decision_trees[path][1]
 
 
 def car_dict(file: str) -> dict:
     """
     Read car data from a file and return a dictionary with car models as keys and their
     attributes as values.
-    """
-    car_attributes_dict = {}
 
-    with open(file, mode='r', encoding='utf-8') as csv_file:
-        reader = csv.reader(csv_file)
-        next(reader)
+    The file is read through the shared catalog, so it is only parsed again if it has changed.
+    """
+    catalog = load_catalog(file)
+    return {catalog.names[i]: catalog.attributes(i) for i in range(len(catalog))}
 
-        for row in reader:
-            car_model = row[0]
-            attributes = [
-                float(row[6]),  # rating
-                float(row[7]),  # reliability
-                float(row[8]),  # zero_to_sixty
-                int(row[9]),  # max_speed
-                row[10],  # image path
-                row[1],  # engine
-                int(row[2]),  # horsepower
-                int(row[3]),  # price
-                int(row[4]),  # torque
-                row[5]  # car type
-            ]
-            car_attributes_dict[car_model] = attributes
 
-    return car_attributes_dict
+def encode_preferences(preferences: list) -> list:
+    """
+    Encodes a user's engine type, horsepower range, price range, torque range and car type into the numerical
+    categories used by the levels of the decision tree.
+    """
+    lst = ['x', 'x', 'x', 'x', 'x']
+    lst[0] = encode_engine(preferences[0])
+    lst[1] = encode_hp2(preferences[1])
+    lst[2] = encode_price2(preferences[2])
+    lst[3] = encode_torque2(preferences[3])
+    lst[4] = encode_car_type(preferences[4])
+    return lst
 
 
 def car_guesser(car_file: str, preferences: list) -> list:
@@ -341,19 +554,15 @@ def car_guesser(car_file: str, preferences: list) -> list:
 
     Suggests car models based on user preferences by querying a decision tree built from car data.
 
-    This function first builds a decision tree from a given CSV file containing car data. Then, it takes a list of
+    This function first loads the decision tree of a given CSV file containing car data. Then, it takes a list of
     user preferences for car features (like engine type, horsepower, price range, torque, and car type),
     encodes these preferences into a format that matches the tree's structure, and uses the tree to find car models
     that match these preferences.
     """
-    decision_tree = build_decision_tree(car_file)
-    lst = ['x', 'x', 'x', 'x', 'x']
-    lst[0] = encode_engine(preferences[0])
-    lst[1] = encode_hp2(preferences[1])
-    lst[2] = encode_price2(preferences[2])
-    lst[3] = encode_torque2(preferences[3])
-    lst[4] = encode_car_type(preferences[4])
-    possible_cars = decision_tree.find_cars(lst)
+    decision_tree = load_decision_tree(car_file)
+    with metrics.span('tree_query'):
+        possible_cars = decision_tree.find_cars(encode_preferences(preferences))
+    metrics.count('candidates', len(possible_cars))
 
     if not possible_cars:
         return []
@@ -364,7 +573,8 @@ def car_guesser(car_file: str, preferences: list) -> list:
         return lst
 
 
-def car_ranker(preferences: list[str], chosen_cars: list[str], all_cars: dict) -> Any:
+def car_ranker(preferences: list[str], chosen_cars: list[str], all_cars: dict, k: Optional[int] = None, *,
+               bounds: dict[str, tuple[float, float]]) -> Any:
     """
      Ranks cars based on user preferences and calculates a performance score for each.
 
@@ -375,7 +585,8 @@ def car_ranker(preferences: list[str], chosen_cars: list[str], all_cars: dict) -
 
     The performance score is adjusted based on the car's attributes relative to maximum and minimum values across all
     cars, aiming to highlight cars with better overall performance.
-    1) In the first step we factor out the max/min hp, max/min torque,the max/min zero_to_sixty and max/min speed. Then
+    1) In the first step we factor out the max/min hp, max/min torque,the max/min zero_to_sixty and max/min speed
+    across all cars (see bounds below). Then
     we normalize hp, torque and speed on a scale of  0-1. Without normalization comparing a 700hp to a 200hp would seem
     unfair.  This rescales the actual HP and torque to a value between 0 and 1 based on where they lie between the
     minimum and maximum values in the dataset.
@@ -383,55 +594,63 @@ def car_ranker(preferences: list[str], chosen_cars: list[str], all_cars: dict) -
     would have a lower which is the opposite of what we wantThe formula 1 - ((value - min_value) / (max_value -
     min_value)) inverts the scale so that a lower 0-60 time translates to a higher normalized score.
     3) In the third step, we just combine the scores to give us a final performance score.
+
+    The scores of all chosen cars are computed together by ranking.rank_columns. If k is not None, only the k best
+    cars are returned, and they are found without sorting the rest.
+
+    bounds maps 'hp', 'torque', 'zero_to_sixty' and 'max_speed' to their (min, max) across all cars, and should be
+    ranking.performance_bounds(catalog) of the loaded catalog, which is computed once per catalog instead of once
+    per query.
     """
 
     if not chosen_cars:
         return None
-    rating_weight = int(preferences[0]) / 100
-    reliability_weight = int(preferences[1]) / 100
-    zero_to_sixity_weight = int(preferences[2]) / 100
-    max_speed_weight = int(preferences[3]) / 100
 
-    max_hp, min_hp = 1020, 169
-    max_torque, min_torque = 1050, 205
-    max_zero_to_sixty, min_zero_to_sixty = 11, 2
-    max_speed, min_speed = 340, 170
+    chosen_cars = list(dict.fromkeys(chosen_cars))
+    columns = {
+        'rating': np.array([all_cars[car][0] for car in chosen_cars], dtype=np.float64),
+        'reliability': np.array([all_cars[car][1] for car in chosen_cars], dtype=np.float64),
+        'zero_to_sixty': np.array([all_cars[car][2] for car in chosen_cars], dtype=np.float64),
+        'max_speed': np.array([all_cars[car][3] for car in chosen_cars], dtype=np.float64),
+        'hp': np.array([all_cars[car][6] for car in chosen_cars], dtype=np.float64),
+        'torque': np.array([all_cars[car][8] for car in chosen_cars], dtype=np.float64)
+    }
+    image_paths = [all_cars[car][4] for car in chosen_cars]
 
-    dictionary = {}
-    for car in chosen_cars:
-        speed = all_cars[car][3]
-        horsepower = all_cars[car][6]
-        torque = all_cars[car][8]
-        zero_to_sixity = all_cars[car][2]
-        print(zero_to_sixity)
+    return ranking.rank_columns(chosen_cars, preferences, columns, image_paths, bounds, k)
 
-        rate_score = all_cars[car][0] * rating_weight
-        reliability_score = all_cars[car][1] * reliability_weight
-        zero_to_sixity_score = all_cars[car][2] * zero_to_sixity_weight
-        max_speed_score = all_cars[car][3] * max_speed_weight
-        total_score = (rate_score + reliability_score - zero_to_sixity_score + max_speed_score) / 4
-        img_path = all_cars[car][4]
-        image = os.path.join(img_path + '.jpg')
 
-        normalized_speed = (speed - min_speed) / (max_speed - min_speed)
-        normalized_hp = (horsepower - min_hp) / (max_hp - min_hp)
-        normalized_torque = (torque - min_torque) / (max_torque - min_torque)
-        normalized_zero_to_sixty = 1 - ((zero_to_sixity - min_zero_to_sixty) / (max_zero_to_sixty - min_zero_to_sixty))
+def rank_profiles(car_file: str, profiles: list[tuple[list, list]]) -> list:
+    """
+    Suggests and ranks cars for many users at once, returning one car_ranker result per (direct preferences,
+    slider weights) profile, in the same order as profiles.
 
-        combined_score = (normalized_hp + normalized_torque + normalized_zero_to_sixty + normalized_speed) / 4
-        performance_score = combined_score * 100
+    The result for each profile is the same as car_ranker(weights, car_guesser(car_file, preferences), all_cars),
+    but the catalog, decision tree and car dictionary are loaded once for every profile. Profiles whose preferences
+    fall in the same bucket of the decision tree share one tree search, and profiles that also have the same
+    weights share one ranking.
 
-        if performance_score < 50:
-            performance_score += 20
+    Preconditions:
+        - every profile is a pair of a list of the 5 dropdown choices and a list of the 4 slider values
+    """
+    decision_tree = load_decision_tree(car_file)
+    all_cars = car_dict(car_file)
+    bounds = ranking.performance_bounds(load_catalog(car_file))
 
-        if 51 <= performance_score < 75:
-            performance_score += 20
-        pf = round(performance_score)
+    buckets = {}
+    rankings = {}
+    results = []
+    for preferences, weights in profiles:
+        bucket = tuple(encode_preferences(preferences))
+        if bucket not in buckets:
+            buckets[bucket] = decision_tree.find_cars(list(bucket))
 
-        dictionary[car] = total_score, image, pf
+        key = (bucket, tuple(int(weight) for weight in weights))
+        if key not in rankings:
+            rankings[key] = car_ranker(weights, buckets[bucket], all_cars, bounds=bounds)
+        results.append(rankings[key])
 
-    ranked_cars = sorted(dictionary.items(), key=lambda x: x[1], reverse=True)
-    return ranked_cars
+    return results
 
 
 if __name__ == '__main__':
@@ -452,7 +671,7 @@ if __name__ == '__main__':
     python_ta.check_all(config={
         'max-line-length': 120,
         'disable': ['E1136'],
-        'extra-imports': ['csv', 'os'],
-        'allowed-io': ['car_dict', 'build_decision_tree'],
+        'extra-imports': ['os', 'numpy', 'catalog', 'metrics', 'ranking'],
+        'allowed-io': [],
         'max-nested-blocks': 4
     })
@@ -0,0 +1,94 @@
+"""
+Image Cache for Car Recommendation Tool
+
+Module Description ================== This module keeps the car images shown on the results screen decoded and scaled
+in memory. Every image is stored once per (image path, target size), so a car image is only read from disk, decoded
+and scaled the first time it is shown at a given size. The cache holds at most a fixed number of bytes of pixel
+data and evicts the least recently used images when it is full.
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+
+"""
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+
+import pygame
+
+
+class ImageCache:
+    """A least recently used cache of decoded and scaled images.
+
+    Instance Attributes:
+        - max_bytes: The largest number of bytes of pixel data kept in the cache.
+        - hits: The number of images returned from the cache.
+        - misses: The number of images that had to be loaded from disk.
+
+    Representation Invariants:
+        - self.max_bytes > 0
+        - self._bytes == sum(_surface_bytes(surface) for surface in self._entries.values())
+    """
+    max_bytes: int
+    hits: int
+    misses: int
+
+    # Private Instance Attributes:
+    #     - _entries: Maps (image path, (width, height)) to its scaled image, from least to most recently used.
+    #     - _bytes: The number of bytes of pixel data currently in the cache.
+    _entries: OrderedDict[tuple[str, tuple[int, int]], pygame.Surface]
+    _bytes: int
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """Initialize a new empty image cache holding at most max_bytes of pixel data."""
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def get(self, path: str, size: tuple[int, int]) -> pygame.Surface:
+        """Return the image stored at path, scaled to size, loading it only if it is not already cached."""
+        key = (path, size)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        surface = pygame.transform.scale(pygame.image.load(path), size)
+        self._entries[key] = surface
+        self._bytes += _surface_bytes(surface)
+
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= _surface_bytes(evicted)
+
+        return surface
+
+    def prefetch(self, requests: list[tuple[str, tuple[int, int]]]) -> None:
+        """Load every (image path, size) in requests into the cache, so drawing them later does not touch the disk.
+        """
+        for path, size in requests:
+            self.get(path, size)
+
+    def clear(self) -> None:
+        """Remove every image from the cache."""
+        self._entries.clear()
+        self._bytes = 0
+
+
+def _surface_bytes(surface: pygame.Surface) -> int:
+    """Return the number of bytes of pixel data in surface."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def car_image_file(image_path: str) -> str:
+    """Return the file of the car image stored at the given image path of the car data file."""
+    return os.path.join(image_path + '.jpg')
+
+
+car_images = ImageCache()
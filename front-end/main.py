@@ -8,8 +8,13 @@ input, display of car statistics, and visualization of recommendation results.
 
 The module integrates with several other modules to manage data handling and recommendation logic:
 - `assets.py`: Manages loading and processing of graphical assets and car data.
+- `image_cache.py`: Keeps the decoded and scaled car images in memory between frames and searches.
+- `text_cache.py`: Keeps rendered text in memory so unchanged labels are not rasterized every frame.
 - `tree.py`: Implements data structures and algorithms for organizing and querying car data.
 - `project_graphs.py`: Contains graph-based logic for generating car recommendations.
+- `recommendation_service.py`: Keeps the similarity backend loaded and caches recommendations between searches.
+- `snapshot.py`: Loads the compiled catalog and decision tree at startup instead of parsing the car data file.
+- `metrics.py`: Records stage timings and frame times when CAR_METRICS=1 is set, and logs them once a minute.
 
 Key functionalities include event handling for user input, rendering of UI elements, and displaying the results of
 the recommendation algorithm.
@@ -25,9 +30,18 @@ expressly prohibited.
 This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
 """
 
+import time
+
 from assets import *
+from image_cache import car_images, car_image_file
+from text_cache import render_text
 from tree import *
 from project_graphs import *
+from catalog import load_catalog
+import metrics
+from ranking import performance_bounds
+from recommendation_service import get_recommendation_service
+from snapshot import load_snapshot
 
 pygame.init()
 
@@ -39,6 +53,9 @@ pygame.display.set_caption("Project 2")
 direct_selections = ['x', 'x', 'x', 'x', 'x']
 undirect_selections = ['0', '0', '0', '0']
 
+# The start screen is only drawn again when something on it changes, and at most this many times per second.
+MAX_FPS = 60
+
 # Engine
 eng_items = ['V4', 'V6', 'V8', 'V10', 'V12', 'Electric']
 eng_top_txt = "None Selected"
@@ -81,7 +98,7 @@ def drop_down_menu_ct() -> None:
     """
     pygame.draw.rect(screen, D_GRAY, ct_item_box_rect)
     pygame.draw.rect(screen, BLACK, ct_item_box_rect, 4)
-    text_surf_5 = s_font_2.render(ct_top_txt, True, WHITE)
+    text_surf_5 = render_text(s_font_2, ct_top_txt, WHITE)
     centered_x_5 = ct_item_box_rect.x + (ct_item_box_rect.width - text_surf_5.get_width()) // 2
     centered_y_5 = ct_item_box_rect.y + (ct_item_box_rect.height - text_surf_5.get_height()) // 2
     screen.blit(text_surf_5, (centered_x_5, centered_y_5))
@@ -91,7 +108,7 @@ def drop_down_menu_ct() -> None:
             item_rect = ct_item_rects[i]
             pygame.draw.rect(screen, D_GRAY, item_rect)
             pygame.draw.rect(screen, BLACK, item_rect, 4)
-            item_text_surf = s_font_2.render(item, True, WHITE)
+            item_text_surf = render_text(s_font_2, item, WHITE)
             centered_x = item_rect.x + (item_rect.width - item_text_surf.get_width()) // 2
             centered_y = item_rect.y + (item_rect.height - item_text_surf.get_height()) // 2
             screen.blit(item_text_surf, (centered_x, centered_y))
@@ -103,7 +120,7 @@ def drop_down_menu_tq() -> None:
     """
     pygame.draw.rect(screen, D_GRAY, tq_item_box_rect)
     pygame.draw.rect(screen, BLACK, tq_item_box_rect, 4)
-    text_surf_4 = s_font_2.render(tq_top_txt, True, WHITE)
+    text_surf_4 = render_text(s_font_2, tq_top_txt, WHITE)
     centered_x_4 = tq_item_box_rect.x + (tq_item_box_rect.width - text_surf_4.get_width()) // 2
     centered_y_4 = tq_item_box_rect.y + (tq_item_box_rect.height - text_surf_4.get_height()) // 2
     screen.blit(text_surf_4, (centered_x_4, centered_y_4))
@@ -113,7 +130,7 @@ def drop_down_menu_tq() -> None:
             item_rect = tq_item_rects[i]
             pygame.draw.rect(screen, D_GRAY, item_rect)
             pygame.draw.rect(screen, BLACK, item_rect, 4)
-            item_text_surf = s_font_2.render(item, True, WHITE)
+            item_text_surf = render_text(s_font_2, item, WHITE)
             centered_x = item_rect.x + (item_rect.width - item_text_surf.get_width()) // 2
             centered_y = item_rect.y + (item_rect.height - item_text_surf.get_height()) // 2
             screen.blit(item_text_surf, (centered_x, centered_y))
@@ -125,7 +142,7 @@ def drop_down_menu_pr() -> None:
     """
     pygame.draw.rect(screen, D_GRAY, pr_item_box_rect)
     pygame.draw.rect(screen, BLACK, pr_item_box_rect, 4)
-    text_surf_3 = s_font_2.render(pr_top_txt, True, WHITE)
+    text_surf_3 = render_text(s_font_2, pr_top_txt, WHITE)
     centered_x_3 = pr_item_box_rect.x + (pr_item_box_rect.width - text_surf_3.get_width()) // 2
     centered_y_3 = pr_item_box_rect.y + (pr_item_box_rect.height - text_surf_3.get_height()) // 2
     screen.blit(text_surf_3, (centered_x_3, centered_y_3))
@@ -135,7 +152,7 @@ def drop_down_menu_pr() -> None:
             item_rect = pr_item_rects[i]
             pygame.draw.rect(screen, D_GRAY, item_rect)
             pygame.draw.rect(screen, BLACK, item_rect, 4)
-            item_text_surf = s_font_2.render(item, True, WHITE)
+            item_text_surf = render_text(s_font_2, item, WHITE)
             centered_x = item_rect.x + (item_rect.width - item_text_surf.get_width()) // 2
             centered_y = item_rect.y + (item_rect.height - item_text_surf.get_height()) // 2
             screen.blit(item_text_surf, (centered_x, centered_y))
@@ -147,7 +164,7 @@ def drop_down_menu_hp() -> None:
     """
     pygame.draw.rect(screen, D_GRAY, hp_item_box_rect)
     pygame.draw.rect(screen, BLACK, hp_item_box_rect, 4)
-    text_surf_2 = s_font_2.render(hp_top_txt, True, WHITE)
+    text_surf_2 = render_text(s_font_2, hp_top_txt, WHITE)
     centered_x_2 = hp_item_box_rect.x + (hp_item_box_rect.width - text_surf_2.get_width()) // 2
     centered_y_2 = hp_item_box_rect.y + (hp_item_box_rect.height - text_surf_2.get_height()) // 2
     screen.blit(text_surf_2, (centered_x_2, centered_y_2))
@@ -157,7 +174,7 @@ def drop_down_menu_hp() -> None:
             item_rect = hp_item_rects[i]
             pygame.draw.rect(screen, D_GRAY, item_rect)
             pygame.draw.rect(screen, BLACK, item_rect, 4)
-            item_text_surf = s_font_2.render(item, True, WHITE)
+            item_text_surf = render_text(s_font_2, item, WHITE)
             centered_x = item_rect.x + (item_rect.width - item_text_surf.get_width()) // 2
             centered_y = item_rect.y + (item_rect.height - item_text_surf.get_height()) // 2
             screen.blit(item_text_surf, (centered_x, centered_y))
@@ -169,7 +186,7 @@ def dropdown_menu_eng() -> None:
     """
     pygame.draw.rect(screen, D_GRAY, eng_item_box_rect)
     pygame.draw.rect(screen, BLACK, eng_item_box_rect, 4)
-    text_surf = s_font_2.render(eng_top_txt, True, WHITE)
+    text_surf = render_text(s_font_2, eng_top_txt, WHITE)
     centered_x = eng_item_box_rect.x + (eng_item_box_rect.width - text_surf.get_width()) // 2
     centered_y = eng_item_box_rect.y + (eng_item_box_rect.height - text_surf.get_height()) // 2
     screen.blit(text_surf, (centered_x, centered_y))
@@ -179,7 +196,7 @@ def dropdown_menu_eng() -> None:
             item_rect = eng_item_rects[i]
             pygame.draw.rect(screen, D_GRAY, item_rect)
             pygame.draw.rect(screen, BLACK, item_rect, 4)
-            item_text_surf = s_font_2.render(item, True, WHITE)
+            item_text_surf = render_text(s_font_2, item, WHITE)
             centered_x = item_rect.x + (item_rect.width - item_text_surf.get_width()) // 2
             centered_y = item_rect.y + (item_rect.height - item_text_surf.get_height()) // 2
             screen.blit(item_text_surf, (centered_x, centered_y))
@@ -261,11 +278,17 @@ class Slider:
         """
         return self.value
 
+    def region(self) -> pygame.Rect:
+        """
+        Returns the part of the screen the slider line, its thumb and its value can be drawn in.
+        """
+        return pygame.Rect(self.rect.left - 40, self.rect.top - 60, self.rect.width + 80, 90)
+
     def draw_value(self, screens: pygame.Surface, font: Any) -> None:
         """
         Draws the current value of the slider near the thumb for easy viewing.
         """
-        value_surf = font.render(str(int(self.value)), True, GRAY)
+        value_surf = render_text(font, str(int(self.value)), GRAY)
         value_rect = value_surf.get_rect(center=(self.thumb_rect.centerx, self.thumb_rect.top - 20))
         screens.blit(value_surf, value_rect)
 
@@ -276,6 +299,99 @@ zero_sixty_slider = Slider(800, 700, 300, 20, 0, 100)
 max_speed_slider = Slider(1195, 700, 300, 20, 0, 100)
 
 
+def start_screen_background(search_button_rect: pygame.Rect) -> pygame.Surface:
+    """
+    Draws every part of the start screen that never changes onto a new surface, so it only has to be drawn once.
+
+    This includes the header, the prompts above each dropdown menu and slider, and the search button.
+    """
+    background = pygame.Surface(window_size)
+    background.fill(PURPLE)
+    pygame.draw.rect(background, D_PURPLE, (0, 0, window_size[0], 200))
+    pygame.draw.rect(background, BLACK, (0, 200, window_size[0], 10))
+
+    deluxe_text = pygame.transform.rotate(render_text(t_font_1, 'DELUXE', GRAY), 90)
+    auto_text = render_text(t_font_1, 'AUTO', GRAY)
+    sales_text = render_text(t_font_2, 'SALES', GRAY)
+    background.blit(deluxe_text, (20, 25))
+    background.blit(auto_text, (55, 30))
+    background.blit(sales_text, (55, 65))
+
+    background.blit(location_emblem, (1185, 30))
+    background.blit(phone_emblem, (1190, 100))
+    background.blit(clock_emblem, (1190, 160))
+    background.blit(render_text(s_font_1, '321 Bloor St W, Toronto, 0N, M1CL5G  ', GRAY), (1240, 45))
+    background.blit(render_text(s_font_1, 'Sales: (416) 784-3312', GRAY), (1240, 107))
+    background.blit(render_text(s_font_1, 'Open Today from 9:00 AM - 7:00 PM ', GRAY), (1240, 167))
+
+    background.blit(render_text(s_font_2, 'Select an Engine Type', GRAY), (65, 250))
+    background.blit(render_text(s_font_2, 'Select a Horsepower Range', GRAY), (350, 250))
+    background.blit(render_text(s_font_2, 'Select a Price Range', GRAY), (670, 250))
+    background.blit(render_text(s_font_2, 'Select a Torque Range', GRAY), (965, 250))
+    background.blit(render_text(s_font_2, 'Select a Car Type', GRAY), (1280, 250))
+    background.blit(render_text(s_font_1, 'How much do you care about reliability?', GRAY), (20, 620))
+    background.blit(render_text(s_font_1, 'How much do you care about rating?', GRAY), (420, 620))
+    background.blit(render_text(s_font_1, 'How much do you care about the 0-60?', GRAY), (810, 620))
+    background.blit(render_text(s_font_1, 'How much do you care about max speed?', GRAY), (1200, 620))
+
+    pygame.draw.rect(background, (34, 139, 34), search_button_rect, 0, 15)
+    text_surf = render_text(s_font_2, 'Search', WHITE)
+    background.blit(text_surf, text_surf.get_rect(center=search_button_rect.center))
+
+    return background
+
+
+def start_screen_widgets() -> list[tuple[tuple, pygame.Rect]]:
+    """
+    Returns the state of every dropdown menu and slider on the start screen, each paired with the part of the
+    screen it is drawn in. A widget only has to be drawn again when its state changes.
+    """
+    return [
+        ((eng_top_txt, eng_opt_active), eng_item_box_rect.unionall(eng_item_rects)),
+        ((hp_top_txt, hp_opt_active), hp_item_box_rect.unionall(hp_item_rects)),
+        ((pr_top_txt, pr_opt_active), pr_item_box_rect.unionall(pr_item_rects)),
+        ((tq_top_txt, tq_opt_active), tq_item_box_rect.unionall(tq_item_rects)),
+        ((ct_top_txt, ct_opt_active), ct_item_box_rect.unionall(ct_item_rects)),
+        ((reliability_slider.thumb_rect.center, int(reliability_slider.value)), reliability_slider.region()),
+        ((rating_slider.thumb_rect.center, int(rating_slider.value)), rating_slider.region()),
+        ((zero_sixty_slider.thumb_rect.center, int(zero_sixty_slider.value)), zero_sixty_slider.region()),
+        ((max_speed_slider.thumb_rect.center, int(max_speed_slider.value)), max_speed_slider.region())
+    ]
+
+
+def redraw_start_screen(background: pygame.Surface, dirty_rects: list[pygame.Rect]) -> None:
+    """
+    Draws the given parts of the start screen again and pushes only those parts to the display.
+
+    Each part is restored from the pre-drawn background, and the dropdown menus and sliders are drawn on top of it
+    with drawing clipped to that part.
+    """
+    for rect in dirty_rects:
+        screen.set_clip(rect)
+        screen.blit(background, rect, rect)
+        dropdown_menu_eng()
+        drop_down_menu_hp()
+        drop_down_menu_pr()
+        drop_down_menu_tq()
+        drop_down_menu_ct()
+        for slider in (reliability_slider, rating_slider, zero_sixty_slider, max_speed_slider):
+            slider.draw(screen)
+            slider.draw_value(screen, s_font_2)
+    screen.set_clip(None)
+    pygame.display.update(dirty_rects)
+
+
+def show_message(message: pygame.Surface) -> pygame.Rect:
+    """
+    Shows a message under the sliders for one second and returns the part of the screen it covered.
+    """
+    message_rect = message.get_rect(topleft=(625, 770))
+    screen.blit(message, message_rect)
+    pygame.display.update(message_rect)
+    pygame.time.wait(1000)
+    return message_rect
+
+
 def start_screen() -> None:
     """
     Runs the main event loop for the start screen of a car dealership application.
@@ -297,8 +413,19 @@ def start_screen() -> None:
     redo_message_displayed = False
     running = True
 
+    clock = pygame.time.Clock()
+    background = start_screen_background(search_button_rect)
+    dirty_rects = [screen.get_rect()]
+
     while running:
-        for event in pygame.event.get():
+        if dirty_rects:
+            with metrics.span('ui_frame'):
+                redraw_start_screen(background, dirty_rects)
+            dirty_rects = []
+        clock.tick(MAX_FPS)
+
+        widgets_before = start_screen_widgets()
+        for event in [pygame.event.wait()] + pygame.event.get():
             rating_slider.handle_event(event, undirect_selections, 0)
             reliability_slider.handle_event(event, undirect_selections, 1)
             zero_sixty_slider.handle_event(event, undirect_selections, 2)
@@ -311,7 +438,8 @@ def start_screen() -> None:
                     if all(selection != 'x' for selection in direct_selections):
                         all_fitting_cars = car_guesser('car_data_set.csv', direct_selections)
                         all_cars = car_dict('car_data_set.csv')
-                        ranked_list = car_ranker(undirect_selections, all_fitting_cars, all_cars)
+                        ranked_list = car_ranker(undirect_selections, all_fitting_cars, all_cars,
+                                                 bounds=performance_bounds(load_catalog('car_data_set.csv')))
                         if ranked_list is None:
                             redo_message_displayed = True
                         else:
@@ -390,79 +518,19 @@ def start_screen() -> None:
                         pr_opt_active = False
                         tq_opt_active = False
                         ct_opt_active = False
+            elif event.type in (pygame.VIDEORESIZE, pygame.WINDOWEXPOSED):
+                dirty_rects.append(screen.get_rect())
             if error_message_displayed:
-                select_all_text = s_font_1.render('Invalid! Make sure you selected all keys', True, GRAY)
-                screen.blit(select_all_text, (625, 770))
-                pygame.display.update()
-                pygame.time.wait(1000)
+                select_all_text = render_text(s_font_1, 'Invalid! Make sure you selected all keys', GRAY)
+                dirty_rects.append(show_message(select_all_text))
                 error_message_displayed = False
             if redo_message_displayed:
-                select_all_text = s_font_1.render('Sorry nothing matching the criteria, try again.', True, GRAY)
-                screen.blit(select_all_text, (625, 770))
-                pygame.display.update()
-                pygame.time.wait(1000)
+                select_all_text = render_text(s_font_1, 'Sorry nothing matching the criteria, try again.', GRAY)
+                dirty_rects.append(show_message(select_all_text))
                 redo_message_displayed = False
 
-        screen.fill(PURPLE)
-        pygame.draw.rect(screen, D_PURPLE, (0, 0, window_size[0], 200))
-        pygame.draw.rect(screen, BLACK, (0, 200, window_size[0], 10))
-
-        deluxe_text = pygame.transform.rotate(t_font_1.render('DELUXE', True, GRAY), 90)
-        auto_text = t_font_1.render('AUTO', True, GRAY)
-        sales_text = t_font_2.render('SALES', True, GRAY)
-        screen.blit(deluxe_text, (20, 25))
-        screen.blit(auto_text, (55, 30))
-        screen.blit(sales_text, (55, 65))
-
-        screen.blit(location_emblem, (1185, 30))
-        screen.blit(phone_emblem, (1190, 100))
-        screen.blit(clock_emblem, (1190, 160))
-        location_text = s_font_1.render('321 Bloor St W, Toronto, 0N, M1CL5G  ', True, GRAY)
-        phone_text = s_font_1.render('Sales: (416) 784-3312', True, GRAY)
-        hours_text = s_font_1.render('Open Today from 9:00 AM - 7:00 PM ', True, GRAY)
-        screen.blit(location_text, (1240, 45))
-        screen.blit(phone_text, (1240, 107))
-        screen.blit(hours_text, (1240, 167))
-
-        engine_text = s_font_2.render('Select an Engine Type', True, GRAY)
-        screen.blit(engine_text, (65, 250))
-        dropdown_menu_eng()
-        hp_text = s_font_2.render('Select a Horsepower Range', True, GRAY)
-        screen.blit(hp_text, (350, 250))
-        drop_down_menu_hp()
-        pr_text = s_font_2.render('Select a Price Range', True, GRAY)
-        screen.blit(pr_text, (670, 250))
-        drop_down_menu_pr()
-        tq_text = s_font_2.render('Select a Torque Range', True, GRAY)
-        screen.blit(tq_text, (965, 250))
-        drop_down_menu_tq()
-        ct_text = s_font_2.render('Select a Car Type', True, GRAY)
-        screen.blit(ct_text, (1280, 250))
-        drop_down_menu_ct()
-        rl_text = s_font_1.render('How much do you care about reliability?', True, GRAY)
-        screen.blit(rl_text, (20, 620))
-        reliability_slider.draw(screen)
-        reliability_slider.draw_value(screen, s_font_2)
-        rt_text = s_font_1.render('How much do you care about rating?', True, GRAY)
-        screen.blit(rt_text, (420, 620))
-        rating_slider.draw(screen)
-        rating_slider.draw_value(screen, s_font_2)
-        zs_text = s_font_1.render('How much do you care about the 0-60?', True, GRAY)
-        screen.blit(zs_text, (810, 620))
-        zero_sixty_slider.draw(screen)
-        zero_sixty_slider.draw_value(screen, s_font_2)
-        mx_text = s_font_1.render('How much do you care about max speed?', True, GRAY)
-        screen.blit(mx_text, (1200, 620))
-        max_speed_slider.draw(screen)
-        max_speed_slider.draw_value(screen, s_font_2)
-
-        search_button_text = 'Search'
-        pygame.draw.rect(screen, (34, 139, 34), search_button_rect, 0, 15)
-        text_surf = s_font_2.render(search_button_text, True, WHITE)
-        text_rect = text_surf.get_rect(center=search_button_rect.center)
-        screen.blit(text_surf, text_rect)
-
-        pygame.display.update()
+        dirty_rects.extend(region for (before, region), (after, _) in zip(widgets_before, start_screen_widgets())
+                           if before != after)
 
 
 def search_screen(all_cars: dict[str, Any], ranked_list: list[tuple[str, Any]]) -> None:
@@ -481,7 +549,17 @@ def search_screen(all_cars: dict[str, Any], ranked_list: list[tuple[str, Any]])
     search_running = True
     back_button_rect = pygame.Rect(50, 850, 100, 50)
 
+    car = ranked_list[0][0]
+    reccom_cars = get_recommendation_service('car_data_set.csv').recommend_cars(car)
+
+    similar_files = [car_image_file(all_cars[similar_car][4]) for similar_car, _ in reccom_cars]
+    car_image = car_images.get(ranked_list[0][1][1], (350, 300))
+    car_image_1 = car_images.get(similar_files[0], (300, 250))
+    car_image_2, car_image_3, car_image_4, car_image_5 = [car_images.get(file, (200, 150))
+                                                          for file in similar_files[1:5]]
+
     while search_running:
+        frame_start = time.perf_counter()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 search_running = False
@@ -497,69 +575,54 @@ def search_screen(all_cars: dict[str, Any], ranked_list: list[tuple[str, Any]])
         pygame.draw.rect(screen, BLACK, (500, 200, 10, window_size[1] - 200))
         pygame.draw.rect(screen, BLACK, (920, 200, 10, 420))
         pygame.draw.rect(screen, GRAY, back_button_rect)
-        back_text = s_font_2.render('Back', True, BLACK)
+        back_text = render_text(s_font_2, 'Back', BLACK)
 
         back_text_rect = back_text.get_rect(center=back_button_rect.center)
         screen.blit(back_text, back_text_rect)
 
-        auto_text = t_font_2.render('Here Are Our Options For You!', True, GRAY)
+        auto_text = render_text(t_font_2, 'Here Are Our Options For You!', GRAY)
         screen.blit(auto_text, (100, 40))
 
-        text_1 = s_font_4.render('The Best Fitting Car', True, GRAY)
+        text_1 = render_text(s_font_4, 'The Best Fitting Car', GRAY)
         screen.blit(text_1, (50, 300))
 
-        car = ranked_list[0][0]
-        graph = load_complete_graph('car_data_set.csv')
-        reccom_cars = graph.recommend_cars(car)
-        car_image = pygame.transform.scale(pygame.image.load(ranked_list[0][1][1]), (350, 300))
-        car_image_1 = pygame.transform.scale(pygame.image.load(os.path.join(all_cars[reccom_cars[0][0]][4] + '.jpg')),
-                                             (300, 250))
-        car_image_2 = pygame.transform.scale(pygame.image.load(os.path.join(all_cars[reccom_cars[1][0]][4] + '.jpg')),
-                                             (200, 150))
-        car_image_3 = pygame.transform.scale(pygame.image.load(os.path.join(all_cars[reccom_cars[2][0]][4] + '.jpg')),
-                                             (200, 150))
-        car_image_4 = pygame.transform.scale(pygame.image.load(os.path.join(all_cars[reccom_cars[3][0]][4] + '.jpg')),
-                                             (200, 150))
-        car_image_5 = pygame.transform.scale(pygame.image.load(os.path.join(all_cars[reccom_cars[4][0]][4] + '.jpg')),
-                                             (200, 150))
-
         screen.blit(car_image, (50, 360))
         screen.blit(car_image_1, (1050, 270))
         screen.blit(car_image_2, (530, 700))
         screen.blit(car_image_3, (770, 700))
         screen.blit(car_image_4, (1010, 700))
         screen.blit(car_image_5, (1250, 700))
-        stat_text = s_font_5.render('Stats:', True, GRAY)
-        name_text = s_font_4.render(f'{car}', True, GRAY)
-        eng_surf = s_font_2.render(f"Engine: {all_cars[car][5]}", True, GRAY)
-        hp_surf = s_font_2.render(f"Horse Power: {all_cars[car][6]}", True, GRAY)
-        tq_surf = s_font_2.render(f"Torque: {all_cars[car][8]}", True, GRAY)
-        pr_surf = s_font_4.render(f"Price: ${all_cars[car][7]}", True, GRAY)
-        ct_surf = s_font_2.render(f"Car Type: {all_cars[car][9]}", True, GRAY)
-        zts_surf = s_font_2.render(f"Zero to Sixity (mph): {all_cars[car][2]} seconds", True, GRAY)
-        ms_surf = s_font_2.render(f"Max Speed: {all_cars[car][3]} mph", True, GRAY)
-        rt_surf = s_font_2.render(f"Certified Rating Score: {all_cars[car][0]} / 10", True, GRAY)
-        rl_surf = s_font_2.render(f"Certified Reliability Score: {all_cars[car][1]} / 5", True, GRAY)
-        score_surf = s_font_2.render(f"Our Calculated Performance Score: {ranked_list[0][1][2]} ", True, (0, 255, 0))
-        sim_text = s_font_5.render('Our Most Similar Car', True, GRAY)
-        sim1_text = s_font_6.render('Other Similar Cars', True, GRAY)
-
-        name1_text = s_font_2.render(f'{reccom_cars[0][0]}', True, GRAY)
-        pr1_text = s_font_2.render(f'Price: $ {all_cars[reccom_cars[0][0]][7]}', True, GRAY)
-        sm1_text = s_font_2.render(f'Similarity Score: {reccom_cars[0][1]}', True, GRAY)
-
-        name2_text = s_font_2.render(f'{reccom_cars[1][0]}', True, GRAY)
-        pr2_text = s_font_2.render(f'Price: $ {all_cars[reccom_cars[1][0]][7]}', True, GRAY)
-        sm2_text = s_font_2.render(f'Similarity Score: {reccom_cars[1][1]}', True, GRAY)
-        name3_text = s_font_2.render(f'{reccom_cars[2][0]}', True, GRAY)
-        pr3_text = s_font_2.render(f'Price: $ {all_cars[reccom_cars[2][0]][7]}', True, GRAY)
-        sm3_text = s_font_2.render(f'Similarity Score: {reccom_cars[2][1]}', True, GRAY)
-        name4_text = s_font_2.render(f'{reccom_cars[3][0]}', True, GRAY)
-        pr4_text = s_font_2.render(f'Price: $ {all_cars[reccom_cars[3][0]][7]}', True, GRAY)
-        sm4_text = s_font_2.render(f'Similarity Score: {reccom_cars[3][1]}', True, GRAY)
-        name5_text = s_font_2.render(f'{reccom_cars[4][0]}', True, GRAY)
-        pr5_text = s_font_2.render(f'Price: $ {all_cars[reccom_cars[4][0]][7]}', True, GRAY)
-        sm5_text = s_font_2.render(f'Similarity Score: {reccom_cars[4][1]}', True, GRAY)
+        stat_text = render_text(s_font_5, 'Stats:', GRAY)
+        name_text = render_text(s_font_4, f'{car}', GRAY)
+        eng_surf = render_text(s_font_2, f"Engine: {all_cars[car][5]}", GRAY)
+        hp_surf = render_text(s_font_2, f"Horse Power: {all_cars[car][6]}", GRAY)
+        tq_surf = render_text(s_font_2, f"Torque: {all_cars[car][8]}", GRAY)
+        pr_surf = render_text(s_font_4, f"Price: ${all_cars[car][7]}", GRAY)
+        ct_surf = render_text(s_font_2, f"Car Type: {all_cars[car][9]}", GRAY)
+        zts_surf = render_text(s_font_2, f"Zero to Sixity (mph): {all_cars[car][2]} seconds", GRAY)
+        ms_surf = render_text(s_font_2, f"Max Speed: {all_cars[car][3]} mph", GRAY)
+        rt_surf = render_text(s_font_2, f"Certified Rating Score: {all_cars[car][0]} / 10", GRAY)
+        rl_surf = render_text(s_font_2, f"Certified Reliability Score: {all_cars[car][1]} / 5", GRAY)
+        score_surf = render_text(s_font_2, f"Our Calculated Performance Score: {ranked_list[0][1][2]} ", (0, 255, 0))
+        sim_text = render_text(s_font_5, 'Our Most Similar Car', GRAY)
+        sim1_text = render_text(s_font_6, 'Other Similar Cars', GRAY)
+
+        name1_text = render_text(s_font_2, f'{reccom_cars[0][0]}', GRAY)
+        pr1_text = render_text(s_font_2, f'Price: $ {all_cars[reccom_cars[0][0]][7]}', GRAY)
+        sm1_text = render_text(s_font_2, f'Similarity Score: {reccom_cars[0][1]}', GRAY)
+
+        name2_text = render_text(s_font_2, f'{reccom_cars[1][0]}', GRAY)
+        pr2_text = render_text(s_font_2, f'Price: $ {all_cars[reccom_cars[1][0]][7]}', GRAY)
+        sm2_text = render_text(s_font_2, f'Similarity Score: {reccom_cars[1][1]}', GRAY)
+        name3_text = render_text(s_font_2, f'{reccom_cars[2][0]}', GRAY)
+        pr3_text = render_text(s_font_2, f'Price: $ {all_cars[reccom_cars[2][0]][7]}', GRAY)
+        sm3_text = render_text(s_font_2, f'Similarity Score: {reccom_cars[2][1]}', GRAY)
+        name4_text = render_text(s_font_2, f'{reccom_cars[3][0]}', GRAY)
+        pr4_text = render_text(s_font_2, f'Price: $ {all_cars[reccom_cars[3][0]][7]}', GRAY)
+        sm4_text = render_text(s_font_2, f'Similarity Score: {reccom_cars[3][1]}', GRAY)
+        name5_text = render_text(s_font_2, f'{reccom_cars[4][0]}', GRAY)
+        pr5_text = render_text(s_font_2, f'Price: $ {all_cars[reccom_cars[4][0]][7]}', GRAY)
+        sm5_text = render_text(s_font_2, f'Similarity Score: {reccom_cars[4][1]}', GRAY)
 
         screen.blit(name_text, (70, 700))
         screen.blit(pr_surf, (70, 760))
@@ -596,12 +659,16 @@ def search_screen(all_cars: dict[str, Any], ranked_list: list[tuple[str, Any]])
         screen.blit(sm5_text, (1250, 920))
 
         pygame.display.update()
+        metrics.record_since('ui_frame', frame_start)
 
 
 def main() -> None:
     """
     start a new screen
     """
+    if metrics.is_enabled():
+        metrics.start_periodic_log()
+    load_snapshot('car_data_set.csv')
     start_screen()
 
 
@@ -615,7 +682,8 @@ if __name__ == "__main__":
     python_ta.check_all(config={
         'max-line-length': 120,
         'disable': ['E1136'],
-        'extra-imports': ['assets', 'tree_file', 'project_graphs'],
+        'extra-imports': ['assets', 'image_cache', 'text_cache', 'tree_file', 'project_graphs', 'catalog',
+                          'ranking', 'recommendation_service', 'snapshot', 'metrics', 'time'],
         'allowed-io': ['search_screen', 'start_screen', 'handle_event'],
         'max-nested-blocks': 4
     })
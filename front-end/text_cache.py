@@ -0,0 +1,79 @@
+"""
+Text Cache for Car Recommendation Tool
+
+Module Description ================== This module keeps rendered text in memory so that labels which do not change,
+such as headers, prompts, dropdown items and car statistics, are only rasterized once instead of on every frame.
+Rendered text is stored per (font, text, colour, antialias), and the least recently used text is evicted when the
+cache is full. Text that does change, such as the value of a slider while it is dragged, simply adds a new entry
+for each new value.
+
+Copyright and Usage Information
+===============================
+
+This file is Copyright (c) 2024 CSC111 Students Winter (Yaseen Sadat, Muhammad Aneeq, Umer Farooqui, Zarif Ali)
+
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+import pygame
+
+
+class TextCache:
+    """A least recently used cache of rendered text surfaces.
+
+    Instance Attributes:
+        - max_entries: The largest number of rendered texts kept in the cache.
+        - hits: The number of texts returned from the cache.
+        - misses: The number of texts that had to be rendered.
+
+    Representation Invariants:
+        - self.max_entries > 0
+        - len(self._entries) <= self.max_entries
+    """
+    max_entries: int
+    hits: int
+    misses: int
+
+    # Private Instance Attributes:
+    #     - _entries: Maps (font, text, colour, antialias) to its rendered surface, from least to most recently used.
+    _entries: OrderedDict[tuple[pygame.font.Font, str, tuple, bool], pygame.Surface]
+
+    def __init__(self, max_entries: int = 512) -> None:
+        """Initialize a new empty text cache holding at most max_entries rendered texts."""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def render(self, font: pygame.font.Font, text: str, colour: Any, antialias: bool = True) -> pygame.Surface:
+        """Return text rendered with font in the given colour, rendering it only if it is not already cached.
+
+        The returned surface is shared, so it must only be drawn and never drawn on.
+        """
+        key = (font, text, tuple(colour), antialias)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        surface = font.render(text, antialias, colour)
+        self._entries[key] = surface
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        """Remove every rendered text from the cache."""
+        self._entries.clear()
+
+
+text_cache = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, colour: Any, antialias: bool = True) -> pygame.Surface:
+    """Return text rendered with font in the given colour, using the text cache shared by the whole application."""
+    return text_cache.render(font, text, colour, antialias)